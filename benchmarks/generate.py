@@ -0,0 +1,200 @@
+import os
+import json
+import uuid
+import random
+import zipfile
+from typing import Any
+from pbit.datamodelschema import DataModelSchemaData
+
+DAX_TYPES: list[str] = ["string", "double", "int64", "boolean", "dateTime"]
+
+M_TYPES: dict[str, str] = {
+	"string": "type text",
+	"double": "type number",
+	"int64": "Int64.Type",
+	"boolean": "type logical",
+	"dateTime": "type datetime",
+}
+
+def get_lineage_tag(rng: random.Random) -> str:
+	return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def get_column_data(rng: random.Random, name: str, data_type: str) -> Any:
+	return {
+		"name": name,
+		"dataType": data_type,
+		"sourceColumn": name,
+		"lineageTag": get_lineage_tag(rng),
+		"summarizeBy": "sum" if data_type in ["double", "int64"] else "none",
+		"attributeHierarchy": {
+			"state": "ready"
+		},
+		"annotations": [
+			{
+				"name": "SummarizationSetBy",
+				"value": "Automatic"
+			}
+		]
+	}
+
+def get_partition_expression(table_name: str, column_types: dict[str, str]) -> list[str]:
+	field_names = ", ".join(f"\"{name}\"" for name in column_types)
+	transformations = ", ".join(f"{{\"{name}\", {M_TYPES[data_type]}}}" for name, data_type in column_types.items())
+	return [
+		"let",
+		f"\t#\"File Contents1\" = File.Contents( \"C:/data/{table_name}.json\", null),",
+		"\t#\"Json Document1\" = Json.Document( #\"File Contents1\", null),",
+		"\t#\"Table FromList1\" = Table.FromList( #\"Json Document1\", Splitter.SplitByNothing(), null, null, ExtraValues.Error),",
+		f"\t#\"Table ExpandRecordColumn1\" = Table.ExpandRecordColumn( #\"Table FromList1\", \"Column1\", {{{field_names}}}, null),",
+		f"\t#\"Table TransformColumnTypes1\" = Table.TransformColumnTypes( #\"Table ExpandRecordColumn1\", {{{transformations}}}, null)",
+		"in",
+		"\t#\"Table TransformColumnTypes1\"",
+	]
+
+def generate_model_data(
+	table_count: int = 20,
+	column_count: int = 50,
+	measure_count: int = 5,
+	relationship_count: int = 19,
+	partition_count: int = 1,
+	seed: int = 0
+) -> DataModelSchemaData:
+	rng = random.Random(seed)
+	tables: list[Any] = []
+	for t in range(table_count):
+		table_name = f"table_{t}"
+		column_types = {f"column_{c}": DAX_TYPES[c % len(DAX_TYPES)] for c in range(column_count)}
+		columns: list[Any] = [
+			{
+				"type": "rowNumber",
+				"name": "RowNumber-2662979B-1795-4F74-8F37-6A1BA8059B61",
+				"dataType": "int64",
+				"isHidden": True,
+				"isUnique": True,
+				"isKey": True,
+				"isNullable": False,
+				"attributeHierarchy": {
+					"state": "ready"
+				}
+			}
+		]
+		for name, data_type in column_types.items():
+			columns.append(get_column_data(rng, name, data_type))
+
+		partitions: list[Any] = []
+		for p in range(partition_count):
+			partitions.append({
+				"name": f"{table_name}-{p}",
+				"mode": "import",
+				"state": "ready",
+				"queryGroup": "generated",
+				"source": {
+					"type": "m",
+					"expression": get_partition_expression(table_name, column_types)
+				}
+			})
+
+		measures: list[Any] = []
+		for m in range(measure_count):
+			measures.append({
+				"name": f"{table_name}_measure_{m}",
+				"expression": f"SUM('{table_name}'[column_{(m * len(DAX_TYPES) + 1) % max(column_count, 1)}])",
+				"formatString": "0.00",
+				"lineageTag": get_lineage_tag(rng),
+				"dataType": "double"
+			})
+
+		table: Any = {
+			"name": table_name,
+			"lineageTag": get_lineage_tag(rng),
+			"columns": columns,
+			"partitions": partitions,
+			"annotations": [
+				{
+					"name": "PBI_ResultType",
+					"value": "Table"
+				}
+			]
+		}
+		if len(measures) > 0:
+			table["measures"] = measures
+		tables.append(table)
+
+	relationships: list[Any] = []
+	for offset in range(1, max(table_count, 1)):
+		for t in range(table_count - offset):
+			if len(relationships) >= relationship_count:
+				break
+			relationships.append({
+				"name": get_lineage_tag(rng),
+				"fromTable": f"table_{t + offset}",
+				"fromColumn": "column_0",
+				"toTable": f"table_{t}",
+				"toColumn": "column_0",
+				"crossFilteringBehavior": "bothDirections",
+				"joinOnDateBehavior": "datePartOnly",
+				"state": "ready"
+			})
+
+	data: Any = {
+		"name": get_lineage_tag(rng),
+		"compatibilityLevel": 1550,
+		"model": {
+			"culture": "en-US",
+			"dataAccessOptions": {
+				"legacyRedirects": True,
+				"returnErrorValuesAsNull": True
+			},
+			"defaultPowerBIDataSourceVersion": "powerBI_V3",
+			"sourceQueryCulture": "en-US",
+			"tables": tables,
+			"relationships": relationships,
+			"cultures": [
+				{
+					"name": "en-US",
+					"linguisticMetadata": {
+						"content": {
+							"Version": "1.0.0",
+							"Language": "en-US",
+							"DynamicImprovement": "HighConfidence"
+						},
+						"contentType": "json"
+					}
+				}
+			],
+			"queryGroups": [
+				{
+					"folder": "generated",
+					"annotations": [
+						{
+							"name": "PBI_QueryGroupOrder",
+							"value": "0"
+						}
+					]
+				}
+			],
+			"annotations": [
+				{
+					"name": "PBIDesktopVersion",
+					"value": "2.115.842.0"
+				}
+			]
+		}
+	}
+	return data
+
+def write_template(pbit_file_path: str, data: DataModelSchemaData, layout_size: int = 1024 * 1024, seed: int = 0):
+	rng = random.Random(seed)
+	layout = {"sections": [{"name": f"section_{i}", "visualContainers": []} for i in range(8)], "padding": "x" * layout_size}
+	if os.path.exists(pbit_file_path):
+		os.remove(pbit_file_path)
+	with zipfile.ZipFile(pbit_file_path, "w", zipfile.ZIP_DEFLATED) as zip_out:
+		zip_out.writestr("Version", "1.28".encode("utf-16-le"))
+		zip_out.writestr("[Content_Types].xml", "<?xml version=\"1.0\" encoding=\"utf-8\"?><Types/>")
+		zip_out.writestr("DataModelSchema", json.dumps(data, indent=4).encode("utf-16-le"))
+		zip_out.writestr("DiagramLayout", json.dumps({"version": "1.1.0"}).encode("utf-16-le"))
+		zip_out.writestr("Report/Layout", json.dumps(layout).encode("utf-16-le"))
+		zip_out.writestr("Settings", json.dumps({"Version": 4}).encode("utf-16-le"))
+		zip_out.writestr("Metadata", json.dumps({"Version": 5}).encode("utf-16-le"))
+		zip_out.writestr("SecurityBindings", rng.randbytes(256), compress_type=zipfile.ZIP_STORED)
+		zip_out.writestr("DataMashup", rng.randbytes(64 * 1024), compress_type=zipfile.ZIP_STORED)
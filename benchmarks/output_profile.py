@@ -0,0 +1,29 @@
+import time
+import argparse
+from pbit.datamodelschema import encode
+from pbit.datamodelschema.serializer import JSON_ENCODERS
+from generate import generate_model_data
+
+def main():
+	parser = argparse.ArgumentParser(description="compare DataModelSchema size and encode time per output profile")
+	parser.add_argument("--tables", type=int, default=50)
+	parser.add_argument("--columns", type=int, default=200)
+	parser.add_argument("--repeat", type=int, default=3)
+	args = parser.parse_args()
+
+	data = generate_model_data(args.tables, args.columns, relationship_count=args.tables - 1)
+	print(f"{'encoder':<10}{'profile':<10}{'bytes':>14}{'seconds':>10}")
+	for name, encoder in JSON_ENCODERS.items():
+		if not encoder.is_available():
+			continue
+		for profile in ["indented", "compact"]:
+			best = float("inf")
+			size = 0
+			for _ in range(args.repeat):
+				start = time.perf_counter()
+				size = len(encode(data, skip_none=True, profile=profile, encoder=name))
+				best = min(best, time.perf_counter() - start)
+			print(f"{name:<10}{profile:<10}{size:>14}{best:>10.3f}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import argparse
+import platform
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, TypedDict
+import pbit
+from pbit.datamodelschema import DataModelSchema, DataModelSchemaData, remove_none_values, read, write
+from generate import generate_model_data, write_template
+
+class ResultData(TypedDict):
+	best: float
+	mean: float
+	repeat: int
+
+class ReportData(TypedDict):
+	config: dict[str, int]
+	python: str
+	results: dict[str, ResultData]
+
+# setup runs outside the timer and its return value is handed to the timed call
+Benchmark = tuple[Callable[[], Any], Callable[[Any], Any]]
+
+def measure(setup: Callable[[], Any], run: Callable[[Any], Any], repeat: int) -> ResultData:
+	durations: list[float] = []
+	for _ in range(repeat):
+		state = setup()
+		start = time.perf_counter()
+		run(state)
+		durations.append(time.perf_counter() - start)
+	return {
+		"best": min(durations),
+		"mean": sum(durations) / len(durations),
+		"repeat": repeat,
+	}
+
+def get_benchmarks(data: DataModelSchemaData, temp_dir_path: str) -> dict[str, Benchmark]:
+	payload = pickle.dumps(data)
+	template_path = os.path.join(temp_dir_path, "template.pbit")
+	work_path = os.path.join(temp_dir_path, "work.pbit")
+	schema_path = os.path.join(temp_dir_path, "DataModelSchema")
+	unpack_dir_path = os.path.join(temp_dir_path, "unpacked", "pbit")
+	write_template(template_path, data)
+	write(schema_path, data)
+
+	loaded = DataModelSchema()
+	loaded.load(pickle.loads(payload), copy=False)
+	dumped = loaded.dump(remove_none=False)
+
+	def get_fresh_data() -> Any:
+		return pickle.loads(payload)
+
+	def get_fresh_model() -> DataModelSchema:
+		model = DataModelSchema()
+		model.load(pickle.loads(payload), copy=False)
+		return model
+
+	def get_work_path() -> str:
+		shutil.copy(template_path, work_path)
+		return work_path
+
+	def get_unpacked_dir() -> str:
+		shutil.rmtree(os.path.dirname(unpack_dir_path), ignore_errors=True)
+		os.makedirs(os.path.dirname(unpack_dir_path))
+		pbit.unpack(template_path, unpack_dir_path)
+		return unpack_dir_path
+
+	def run_load(state: Any):
+		DataModelSchema().load(state)
+
+	def run_load_owned(state: Any):
+		DataModelSchema().load(state, copy=False)
+
+	def run_load_lazy(state: Any):
+		DataModelSchema().load(state, lazy=True, copy=False)
+
+	def run_unpack(state: Any):
+		shutil.rmtree(os.path.dirname(unpack_dir_path), ignore_errors=True)
+		os.makedirs(os.path.dirname(unpack_dir_path))
+		pbit.unpack(template_path, unpack_dir_path)
+
+	return {
+		"load": (get_fresh_data, run_load),
+		"load_owned": (get_fresh_data, run_load_owned),
+		"load_lazy": (get_fresh_data, run_load_lazy),
+		"dump": (get_fresh_model, lambda model: model.dump()),
+		"dump_keep_none": (get_fresh_model, lambda model: model.dump(remove_none=False)),
+		"dump_cached": (lambda: loaded, lambda model: model.dump(remove_none=False, use_cache=True)),
+		"remove_none_values": (get_fresh_data, remove_none_values),
+		"write": (lambda: dumped, lambda state: write(schema_path, state, skip_none=True)),
+		"write_compact": (lambda: dumped, lambda state: write(schema_path, state, skip_none=True, profile="compact")),
+		"write_parallel": (lambda: dumped, lambda state: write(schema_path, state, skip_none=True, max_workers=None)),
+		"read": (lambda: schema_path, read),
+		"pack": (get_unpacked_dir, lambda state: pbit.pack(state, work_path)),
+		"unpack": (lambda: None, run_unpack),
+		"read_model": (lambda: template_path, pbit.read_model),
+		"read_model_mmap": (lambda: template_path, lambda state: pbit.read_model(state, use_mmap=True)),
+		"load_model": (lambda: template_path, pbit.load_model),
+		"write_model": (get_work_path, lambda state: pbit.write_model(state, loaded)),
+	}
+
+def compare(report: ReportData, baseline: ReportData, threshold: float) -> bool:
+	is_ok = True
+	print(f"{'benchmark':<22}{'baseline':>12}{'current':>12}{'ratio':>9}")
+	for name, result in report["results"].items():
+		if not name in baseline["results"]:
+			print(f"{name:<22}{'-':>12}{result['best']:>12.4f}{'-':>9}")
+			continue
+		base = baseline["results"][name]["best"]
+		ratio = result["best"] / base if base > 0 else float("inf")
+		flag = ""
+		if ratio > 1 + threshold:
+			flag = "  REGRESSION"
+			is_ok = False
+		print(f"{name:<22}{base:>12.4f}{result['best']:>12.4f}{ratio:>9.2f}{flag}")
+	return is_ok
+
+def main():
+	parser = argparse.ArgumentParser(description="benchmark the pbit read / write pipeline on a synthetic model")
+	parser.add_argument("--tables", type=int, default=20)
+	parser.add_argument("--columns", type=int, default=50)
+	parser.add_argument("--measures", type=int, default=5)
+	parser.add_argument("--relationships", type=int, default=19)
+	parser.add_argument("--partitions", type=int, default=1)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--only", nargs="*", default=None, help="names of the benchmarks to run")
+	parser.add_argument("--output", default=None, help="path to write the json report to")
+	parser.add_argument("--baseline", default=None, help="json report to compare against")
+	parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown before a result counts as a regression")
+	args = parser.parse_args()
+
+	config = {
+		"tables": args.tables,
+		"columns": args.columns,
+		"measures": args.measures,
+		"relationships": args.relationships,
+		"partitions": args.partitions,
+		"seed": args.seed,
+	}
+	data = generate_model_data(args.tables, args.columns, args.measures, args.relationships, args.partitions, args.seed)
+
+	report: ReportData = {
+		"config": config,
+		"python": platform.python_version(),
+		"results": {},
+	}
+	with TemporaryDirectory() as temp_dir_path:
+		for name, (setup, run) in get_benchmarks(data, temp_dir_path).items():
+			if args.only != None and not name in args.only:
+				continue
+			report["results"][name] = measure(setup, run, args.repeat)
+			if args.baseline == None:
+				print(f"{name:<22}{report['results'][name]['best']:>12.4f}", file=sys.stderr)
+
+	if args.output != None:
+		with open(args.output, "w") as file:
+			file.write(json.dumps(report, indent=4))
+	else:
+		print(json.dumps(report, indent=4))
+
+	if args.baseline != None:
+		with open(args.baseline, "r") as file:
+			baseline: ReportData = json.loads(file.read())
+		if baseline["config"] != config:
+			print("warning: baseline was recorded with a different model config", file=sys.stderr)
+		if not compare(report, baseline, args.threshold):
+			sys.exit(1)
+
+if __name__ == "__main__":
+	main()
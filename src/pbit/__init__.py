@@ -1,10 +1,14 @@
 import shutil
 import os
 import zipfile
-from tempfile import TemporaryDirectory
 from .datamodelschema import read as read_pbit
 from .datamodelschema import write as write_pbit
 from .datamodelschema import DataModelSchema, DataModelSchemaData
+from .archive import rewrite, read_member, map_member, get_schema_writer, PbitArchive, SCHEMA_MEMBER_NAME
+from .cache import ModelCache
+from .instrument import Instrumentation, SpanData
+from .model import write_model, decode_model, read_model, load_model
+from .batch import transform_models, BatchResultData
 
 def pack(dir_path: str, out_pbit_file_path: str):
 	zip_path = dir_path + ".zip"
@@ -29,39 +33,9 @@ def pack(dir_path: str, out_pbit_file_path: str):
 	shutil.move(zip_path, out_pbit_file_path)
 
 def unpack(pbit_file_path: str, out_dir_path: str):
-	base = os.path.split(out_dir_path)[0]
-	zip_path = base + ".zip"
-
-	# convert to zip file
-	if os.path.exists(zip_path):
-		os.remove(zip_path)
-	shutil.copy(pbit_file_path, zip_path)
-
-	# unzip and extract data
+	# the pbit is already a zip file, so it's extracted in place
 	if os.path.exists(out_dir_path):
 		shutil.rmtree(out_dir_path)
-	zip_ref = zipfile.ZipFile(zip_path, 'r')
+	zip_ref = zipfile.ZipFile(pbit_file_path, 'r')
 	zip_ref.extractall(out_dir_path)
 	zip_ref.close()
-		
-def write_model(pbit_file_path: str, source: DataModelSchemaData | DataModelSchema):
-	with TemporaryDirectory() as temp_dir_path:
-		pbti_dir = temp_dir_path + "/pbit"
-		unpack(pbit_file_path, pbti_dir)
-		if type(source) == DataModelSchema:
-			write_pbit(pbti_dir+"/DataModelSchema", source.dump())
-		elif type(source) == DataModelSchemaData:
-			write_pbit(pbti_dir+"/DataModelSchema", source)
-		pack(pbti_dir, pbit_file_path)	
-
-def read_model(pbit_file_path: str) -> DataModelSchemaData:
-	with TemporaryDirectory() as temp_dir_path:
-		pbti_dir = temp_dir_path + "/pbit"
-		unpack(pbit_file_path, pbti_dir)
-		return read_pbit(pbti_dir+"/DataModelSchema")
-
-def load_model(pbit_file_path: str) -> DataModelSchema:
-	data = read_model(pbit_file_path)
-	model = DataModelSchema()
-	model.load(data)
-	return model
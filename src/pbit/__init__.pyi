@@ -1,7 +1,9 @@
 from .datamodelschema import DataModelSchema, DataModelSchemaData
+from .archive import PbitArchive as PbitArchive, SCHEMA_MEMBER_NAME as SCHEMA_MEMBER_NAME, get_schema_writer as get_schema_writer, map_member as map_member, read_member as read_member, rewrite as rewrite
+from .cache import ModelCache as ModelCache
+from .instrument import Instrumentation as Instrumentation, SpanData as SpanData
+from .model import decode_model as decode_model, load_model as load_model, read_model as read_model, write_model as write_model
+from .batch import BatchResultData as BatchResultData, transform_models as transform_models
 
 def pack(dir_path: str, out_pbit_file_path: str): ...
 def unpack(pbit_file_path: str, out_dir_path: str): ...
-def write_model(pbit_file_path: str, source: DataModelSchemaData | DataModelSchema): ...
-def read_model(pbit_file_path: str) -> DataModelSchemaData: ...
-def load_model(pbit_file_path: str) -> DataModelSchema: ...
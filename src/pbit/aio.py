@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import contextvars
+from contextlib import nullcontext
+from concurrent.futures import Executor, CancelledError
+from typing import Callable, TypeVar, Any
+from .datamodelschema import DataModelSchema, DataModelSchemaData, OutputProfile
+from .cancellation import ACTIVE_CANCEL_EVENT
+from .instrument import ACTIVE_INSTRUMENTATION
+from .cache import ModelCache
+from .model import read_model as read_model_sync, load_model as load_model_sync, write_model as write_model_sync
+
+T = TypeVar("T")
+
+# the executor has to be a thread pool, the call is run inside a copy of the caller's context
+async def run_blocking(
+	func: Callable[..., T],
+	*args: Any,
+	limit: asyncio.Semaphore | None = None,
+	executor: Executor | None = None
+) -> T:
+	loop = asyncio.get_running_loop()
+	event = threading.Event()
+	context = contextvars.copy_context()
+	context.run(ACTIVE_CANCEL_EVENT.set, event)
+	instrumentation = context.get(ACTIVE_INSTRUMENTATION)
+	# tracemalloc's peak is process wide, so it can't be split between calls that overlap
+	assert instrumentation == None or not instrumentation.trace_memory, "instrumentation that traces memory can't be shared by aio calls"
+
+	def call() -> T:
+		if event.is_set():
+			raise CancelledError()
+		return context.run(func, *args)
+
+	async with limit if limit != None else nullcontext():
+		future = loop.run_in_executor(executor, call)
+		try:
+			return await asyncio.shield(future)
+		except asyncio.CancelledError:
+			# the worker stops at its next cancellation check, its slot is held until it has
+			event.set()
+			try:
+				await future
+			except BaseException:
+				pass
+			raise
+
+async def read_model(
+	pbit_file_path: str,
+	cache: ModelCache | None = None,
+	use_mmap: bool = False,
+	limit: asyncio.Semaphore | None = None,
+	executor: Executor | None = None
+) -> DataModelSchemaData:
+	return await run_blocking(read_model_sync, pbit_file_path, cache, use_mmap, limit=limit, executor=executor)
+
+async def load_model(
+	pbit_file_path: str,
+	lazy: bool = False,
+	cache: ModelCache | None = None,
+	use_mmap: bool = False,
+	limit: asyncio.Semaphore | None = None,
+	executor: Executor | None = None
+) -> DataModelSchema:
+	return await run_blocking(load_model_sync, pbit_file_path, lazy, cache, use_mmap, limit=limit, executor=executor)
+
+async def write_model(
+	pbit_file_path: str,
+	source: DataModelSchemaData | DataModelSchema,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	use_cache: bool = False,
+	validate: bool = False,
+	max_workers: int | None = 1,
+	limit: asyncio.Semaphore | None = None,
+	executor: Executor | None = None
+):
+	await run_blocking(write_model_sync, pbit_file_path, source, profile, encoder, use_cache, validate, max_workers, limit=limit, executor=executor)
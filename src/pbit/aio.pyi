@@ -0,0 +1,15 @@
+import asyncio
+from .datamodelschema import DataModelSchema as DataModelSchema, DataModelSchemaData as DataModelSchemaData, OutputProfile as OutputProfile
+from .cancellation import ACTIVE_CANCEL_EVENT as ACTIVE_CANCEL_EVENT
+from .instrument import ACTIVE_INSTRUMENTATION as ACTIVE_INSTRUMENTATION
+from .cache import ModelCache as ModelCache
+from .model import load_model as load_model_sync, read_model as read_model_sync, write_model as write_model_sync
+from concurrent.futures import Executor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+async def run_blocking(func: Callable[..., T], *args: Any, limit: asyncio.Semaphore | None = ..., executor: Executor | None = ...) -> T: ...
+async def read_model(pbit_file_path: str, cache: ModelCache | None = ..., use_mmap: bool = ..., limit: asyncio.Semaphore | None = ..., executor: Executor | None = ...) -> DataModelSchemaData: ...
+async def load_model(pbit_file_path: str, lazy: bool = ..., cache: ModelCache | None = ..., use_mmap: bool = ..., limit: asyncio.Semaphore | None = ..., executor: Executor | None = ...) -> DataModelSchema: ...
+async def write_model(pbit_file_path: str, source: DataModelSchemaData | DataModelSchema, profile: OutputProfile = ..., encoder: str = ..., use_cache: bool = ..., validate: bool = ..., max_workers: int | None = ..., limit: asyncio.Semaphore | None = ..., executor: Executor | None = ...): ...
@@ -0,0 +1,372 @@
+import os
+import json
+import mmap
+import zlib
+import struct
+import zipfile
+from io import BytesIO
+from contextlib import contextmanager
+from copy import copy
+from tempfile import mkstemp
+from typing import BinaryIO, Callable, Iterator, Any
+from .instrument import span, count, count_model
+from .cancellation import check_cancelled
+from .datamodelschema import DataModelSchema, DataModelSchemaData, OutputProfile, decode, write_stream
+from .datamodelschema import validate_schema, get_validation_message
+
+MemberWriter = Callable[[BinaryIO], Any]
+
+SCHEMA_MEMBER_NAME: str = "DataModelSchema"
+
+CHUNK_SIZE: int = 1024 * 1024
+
+ZIP64_EXTRA_ID: int = 0x0001
+DATA_DESCRIPTOR_FLAG: int = 0x08
+ENCRYPTED_FLAG: int = 0x01
+
+def strip_zip64_extra(extra: bytes) -> bytes:
+	out = b""
+	i = 0
+	while i + 4 <= len(extra):
+		field_id, field_length = struct.unpack("<HH", extra[i:i+4])
+		end = i + 4 + field_length
+		if field_id != ZIP64_EXTRA_ID:
+			out += extra[i:end]
+		i = end
+	return out
+
+def get_member_data_offset(src_fp: BinaryIO, info: zipfile.ZipInfo) -> int:
+	src_fp.seek(info.header_offset)
+	header = src_fp.read(zipfile.sizeFileHeader)
+	assert len(header) == zipfile.sizeFileHeader, f"truncated local header for {info.filename}"
+	fields = struct.unpack(zipfile.structFileHeader, header)
+	assert fields[0] == zipfile.stringFileHeader, f"bad local header signature for {info.filename}"
+	name_length = fields[10]
+	extra_length = fields[11]
+	return info.header_offset + zipfile.sizeFileHeader + name_length + extra_length
+
+def copy_raw_member(src_fp: BinaryIO, zip_out: zipfile.ZipFile, info: zipfile.ZipInfo):
+	# copies the still-compressed bytes, sizes and crc are already known so no data descriptor is needed
+	with span("copy", compressed_bytes=info.compress_size):
+		src_fp.seek(get_member_data_offset(src_fp, info))
+
+		out_info = copy(info)
+		out_info.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+		out_info.extra = strip_zip64_extra(info.extra)
+
+		assert zip_out.fp
+		out_fp = zip_out.fp
+		out_fp.seek(zip_out.start_dir)
+		out_info.header_offset = out_fp.tell()
+		out_fp.write(out_info.FileHeader())
+
+		remaining = info.compress_size
+		while remaining > 0:
+			check_cancelled()
+			chunk = src_fp.read(min(CHUNK_SIZE, remaining))
+			assert chunk, f"truncated data for {info.filename}"
+			out_fp.write(chunk)
+			remaining -= len(chunk)
+
+		zip_out.filelist.append(out_info)
+		zip_out.NameToInfo[out_info.filename] = out_info
+		zip_out.start_dir = out_fp.tell()
+
+def get_replacement_info(name: str, info: zipfile.ZipInfo | None) -> zipfile.ZipInfo:
+	if info == None:
+		out_info = zipfile.ZipInfo(name)
+		out_info.compress_type = zipfile.ZIP_DEFLATED
+		return out_info
+
+	assert info
+	out_info = zipfile.ZipInfo(info.filename, info.date_time)
+	out_info.compress_type = info.compress_type
+	if not out_info.compress_type in [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED]:
+		out_info.compress_type = zipfile.ZIP_DEFLATED
+	out_info.comment = info.comment
+	out_info.extra = strip_zip64_extra(info.extra)
+	out_info.create_system = info.create_system
+	out_info.external_attr = info.external_attr
+	return out_info
+
+def read_member(pbit_file_path: str, member_name: str) -> bytes:
+	with span("extract"), zipfile.ZipFile(pbit_file_path, "r") as zip_ref:
+		count("compressed_bytes", zip_ref.getinfo(member_name).compress_size)
+		data = zip_ref.read(member_name)
+		count("bytes", len(data))
+		return data
+
+# hands out the member without reading the archive into memory, stored members are a view straight into the mapping
+# and deflated ones are inflated from it, the view is released once the block exits
+@contextmanager
+def map_member(pbit_file_path: str, member_name: str) -> Iterator[bytes | memoryview]:
+	with span("extract"), open(pbit_file_path, "rb") as file:
+		with zipfile.ZipFile(file, "r") as zip_ref:
+			info = zip_ref.getinfo(member_name)
+			if info.compress_type != zipfile.ZIP_STORED and info.compress_type != zipfile.ZIP_DEFLATED:
+				data = zip_ref.read(member_name)
+				count("bytes", len(data))
+				yield data
+				return
+		assert not info.flag_bits & ENCRYPTED_FLAG, f"{member_name} is encrypted"
+		offset = get_member_data_offset(file, info)
+		if info.compress_size == 0:
+			yield b""
+			return
+
+		with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+			view = memoryview(mapped)[offset:offset + info.compress_size]
+			try:
+				count("compressed_bytes", info.compress_size)
+				member_data: bytes | memoryview = view
+				if info.compress_type == zipfile.ZIP_DEFLATED:
+					member_data = zlib.decompress(view, -zlib.MAX_WBITS, info.file_size)
+				assert len(member_data) == info.file_size, f"bad size for {member_name}"
+				assert zlib.crc32(member_data) == info.CRC, f"bad crc for {member_name}"
+				count("bytes", len(member_data))
+				yield member_data
+			finally:
+				view.release()
+
+def write_member(zip_out: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes | MemberWriter):
+	with span("encode"):
+		if isinstance(data, bytes):
+			zip_out.writestr(info, data)
+		else:
+			with zip_out.open(info, "w") as member_fp:
+				data(member_fp)
+		count("bytes", info.file_size)
+		count("compressed_bytes", info.compress_size)
+
+def rewrite(pbit_file_path: str, out_pbit_file_path: str, members: dict[str, bytes | MemberWriter]):
+	with span("repack"):
+		out_dir_path = os.path.dirname(os.path.abspath(out_pbit_file_path))
+		temp_fd, temp_path = mkstemp(suffix=".zip", dir=out_dir_path)
+		try:
+			with (
+				os.fdopen(temp_fd, "w+b") as out_file,
+				open(pbit_file_path, "rb") as src_file,
+				zipfile.ZipFile(src_file, "r") as zip_in,
+				zipfile.ZipFile(out_file, "w") as zip_out
+			):
+				written: set[str] = set()
+				for info in zip_in.infolist():
+					check_cancelled()
+					if info.filename in members:
+						write_member(zip_out, get_replacement_info(info.filename, info), members[info.filename])
+					else:
+						copy_raw_member(src_file, zip_out, info)
+					written.add(info.filename)
+
+				for name, data in members.items():
+					if not name in written:
+						write_member(zip_out, get_replacement_info(name, None), data)
+
+			os.chmod(temp_path, os.stat(pbit_file_path).st_mode & 0o777)
+			os.replace(temp_path, out_pbit_file_path)
+		except BaseException:
+			if os.path.exists(temp_path):
+				os.remove(temp_path)
+			raise
+
+def get_schema_writer(
+	source: DataModelSchemaData | DataModelSchema,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	use_cache: bool = False,
+	validate: bool = False,
+	max_workers: int | None = 1
+) -> MemberWriter:
+	skip_none = False
+	if isinstance(source, DataModelSchema):
+		with span("dump"):
+			data = source.dump(remove_none=False, use_cache=use_cache)
+			count_model(data)
+		skip_none = True
+	else:
+		data = source
+
+	if validate:
+		with span("validate"):
+			issues = validate_schema(data)
+			assert len(issues) == 0, get_validation_message(issues)
+
+	def write_schema(fp: BinaryIO):
+		write_stream(fp, data, skip_none, profile, encoder, max_workers)
+
+	return write_schema
+
+# opens a pbit once, members are read as they're asked for and every change is written back in one rewrite on commit
+class PbitArchive():
+	pbit_file_path: str
+	profile: OutputProfile
+	encoder: str
+	use_cache: bool
+	validate: bool
+	max_workers: int | None
+	_file: BinaryIO | None
+	_zip: zipfile.ZipFile | None
+	_members: dict[str, bytes | MemberWriter]
+	_model: DataModelSchema | None
+	_is_model_written: bool
+
+	def __init__(
+		self,
+		pbit_file_path: str,
+		profile: OutputProfile = "indented",
+		encoder: str = "stdlib",
+		use_cache: bool = False,
+		validate: bool = False,
+		max_workers: int | None = 1
+	):
+		self.pbit_file_path = pbit_file_path
+		self.profile = profile
+		self.encoder = encoder
+		self.use_cache = use_cache
+		self.validate = validate
+		self.max_workers = max_workers
+		self._file = None
+		self._zip = None
+		self._members = {}
+		self._model = None
+		self._is_model_written = False
+
+	def __enter__(self) -> "PbitArchive":
+		self.open()
+		return self
+
+	def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+		try:
+			if exc_type == None:
+				self.commit()
+		finally:
+			self.close()
+
+	def open(self):
+		if self._zip != None:
+			return
+		self._file = open(self.pbit_file_path, "rb")
+		self._zip = zipfile.ZipFile(self._file, "r")
+
+	def close(self):
+		if self._zip != None:
+			assert self._zip
+			self._zip.close()
+			self._zip = None
+		if self._file != None:
+			assert self._file
+			self._file.close()
+			self._file = None
+
+	def get_zip(self) -> zipfile.ZipFile:
+		assert self._zip, f"archive {self.pbit_file_path} is not open"
+		return self._zip
+
+	def get_names(self) -> list[str]:
+		names = self.get_zip().namelist()
+		for name in self._members:
+			if not name in names:
+				names.append(name)
+		return names
+
+	def get_if_member_exists(self, name: str) -> bool:
+		return name in self._members or name in self.get_zip().NameToInfo
+
+	def read(self, name: str) -> bytes:
+		if name == SCHEMA_MEMBER_NAME and self._model != None:
+			assert self._model
+			return self._get_written(get_schema_writer(self._model, self.profile, self.encoder, self.use_cache, max_workers=self.max_workers))
+		if name in self._members:
+			member = self._members[name]
+			if isinstance(member, bytes):
+				return member
+			return self._get_written(member)
+		with span("extract"):
+			data = self.get_zip().read(name)
+			count("bytes", len(data))
+			return data
+
+	def _get_written(self, writer: MemberWriter) -> bytes:
+		buffer = BytesIO()
+		writer(buffer)
+		return buffer.getvalue()
+
+	def write(self, name: str, data: bytes | MemberWriter):
+		if name == SCHEMA_MEMBER_NAME:
+			self._model = None
+			self._is_model_written = False
+		self._members[name] = data
+
+	def read_text(self, name: str, encoding: str = "utf-16-le") -> str:
+		return self.read(name).decode(encoding)
+
+	def write_text(self, name: str, text: str, encoding: str = "utf-16-le"):
+		self.write(name, text.encode(encoding))
+
+	def read_json(self, name: str, encoding: str = "utf-16-le") -> Any:
+		return json.loads(self.read_text(name, encoding))
+
+	def write_json(self, name: str, data: Any, encoding: str = "utf-16-le"):
+		self.write_text(name, json.dumps(data), encoding)
+
+	def read_model(self) -> DataModelSchemaData:
+		return decode(self.read(SCHEMA_MEMBER_NAME))
+
+	# the loaded model is kept on the archive and written back on commit once it's marked dirty, in place edits to
+	# reference_data or other containers need a mark_dirty call to be seen, after a commit it has to be loaded or
+	# written again to be part of the next one
+	def load_model(self, lazy: bool = False) -> DataModelSchema:
+		if self._model == None:
+			model = DataModelSchema()
+			data = self.read_model()
+			with span("load"):
+				count_model(data)
+				model.load(data, lazy, copy=False)
+			# a schema written but not yet committed now lives in the model, so it still has to be written
+			self._is_model_written = self._members.pop(SCHEMA_MEMBER_NAME, None) != None
+			model.clear_dirty()
+			self._model = model
+		assert self._model
+		return self._model
+
+	# a model passed in here is always written on commit, even if it's the one load_model returned
+	def write_model(self, source: DataModelSchemaData | DataModelSchema):
+		if isinstance(source, DataModelSchema):
+			self._members.pop(SCHEMA_MEMBER_NAME, None)
+			self._model = source
+			self._is_model_written = True
+		else:
+			self.write(SCHEMA_MEMBER_NAME, get_schema_writer(source, self.profile, self.encoder, self.use_cache, self.validate, self.max_workers))
+
+	def is_model_modified(self) -> bool:
+		if self._model == None:
+			return False
+		assert self._model
+		return self._is_model_written or self._model.is_dirty()
+
+	def get_modified(self) -> list[str]:
+		modified = list(self._members.keys())
+		if not SCHEMA_MEMBER_NAME in modified and self.is_model_modified():
+			modified.append(SCHEMA_MEMBER_NAME)
+		return modified
+
+	def is_modified(self) -> bool:
+		return len(self._members) > 0 or self.is_model_modified()
+
+	def commit(self):
+		members = dict(self._members)
+		if self.is_model_modified():
+			assert self._model
+			members[SCHEMA_MEMBER_NAME] = get_schema_writer(self._model, self.profile, self.encoder, self.use_cache, self.validate, self.max_workers)
+		if len(members) == 0:
+			return
+
+		# the source is closed first so it can be replaced on every platform
+		is_open = self._zip != None
+		self.close()
+		rewrite(self.pbit_file_path, self.pbit_file_path, members)
+		self._members = {}
+		self._model = None
+		self._is_model_written = False
+		if is_open:
+			self.open()
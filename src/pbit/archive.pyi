@@ -0,0 +1,51 @@
+import zipfile
+from .datamodelschema import DataModelSchema as DataModelSchema, DataModelSchemaData as DataModelSchemaData, OutputProfile as OutputProfile
+from typing import Any, BinaryIO, Callable, Iterator
+from contextlib import AbstractContextManager
+
+MemberWriter = Callable[[BinaryIO], Any]
+
+SCHEMA_MEMBER_NAME: str
+CHUNK_SIZE: int
+ZIP64_EXTRA_ID: int
+DATA_DESCRIPTOR_FLAG: int
+ENCRYPTED_FLAG: int
+
+def strip_zip64_extra(extra: bytes) -> bytes: ...
+def get_member_data_offset(src_fp: BinaryIO, info: zipfile.ZipInfo) -> int: ...
+def copy_raw_member(src_fp: BinaryIO, zip_out: zipfile.ZipFile, info: zipfile.ZipInfo): ...
+def get_replacement_info(name: str, info: zipfile.ZipInfo | None) -> zipfile.ZipInfo: ...
+def read_member(pbit_file_path: str, member_name: str) -> bytes: ...
+def map_member(pbit_file_path: str, member_name: str) -> AbstractContextManager[bytes | memoryview]: ...
+def write_member(zip_out: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes | MemberWriter): ...
+def rewrite(pbit_file_path: str, out_pbit_file_path: str, members: dict[str, bytes | MemberWriter]): ...
+def get_schema_writer(source: DataModelSchemaData | DataModelSchema, profile: OutputProfile = ..., encoder: str = ..., use_cache: bool = ..., validate: bool = ..., max_workers: int | None = ...) -> MemberWriter: ...
+
+class PbitArchive:
+    pbit_file_path: str
+    profile: OutputProfile
+    encoder: str
+    use_cache: bool
+    validate: bool
+    max_workers: int | None
+    def __init__(self, pbit_file_path: str, profile: OutputProfile = ..., encoder: str = ..., use_cache: bool = ..., validate: bool = ..., max_workers: int | None = ...) -> None: ...
+    def __enter__(self) -> PbitArchive: ...
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any): ...
+    def open(self): ...
+    def close(self): ...
+    def get_zip(self) -> zipfile.ZipFile: ...
+    def get_names(self) -> list[str]: ...
+    def get_if_member_exists(self, name: str) -> bool: ...
+    def read(self, name: str) -> bytes: ...
+    def write(self, name: str, data: bytes | MemberWriter): ...
+    def read_text(self, name: str, encoding: str = ...) -> str: ...
+    def write_text(self, name: str, text: str, encoding: str = ...): ...
+    def read_json(self, name: str, encoding: str = ...) -> Any: ...
+    def write_json(self, name: str, data: Any, encoding: str = ...): ...
+    def read_model(self) -> DataModelSchemaData: ...
+    def load_model(self, lazy: bool = ...) -> DataModelSchema: ...
+    def write_model(self, source: DataModelSchemaData | DataModelSchema): ...
+    def is_model_modified(self) -> bool: ...
+    def get_modified(self) -> list[str]: ...
+    def is_modified(self) -> bool: ...
+    def commit(self): ...
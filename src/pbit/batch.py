@@ -0,0 +1,59 @@
+import traceback
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import TypedDict, Callable
+from .datamodelschema import DataModelSchema
+from .model import load_model, write_model
+
+ModelTransform = Callable[[DataModelSchema], DataModelSchema | None]
+
+class BatchResultData(TypedDict):
+	path: str
+	success: bool
+	error: str | None
+
+def transform_model(pbit_file_path: str, transform: ModelTransform, lazy: bool = False) -> BatchResultData:
+	try:
+		model = load_model(pbit_file_path, lazy)
+		out_model = transform(model)
+		if out_model == None:
+			out_model = model
+		assert out_model
+		write_model(pbit_file_path, out_model)
+	except Exception:
+		return {
+			"path": pbit_file_path,
+			"success": False,
+			"error": traceback.format_exc()
+		}
+	return {
+		"path": pbit_file_path,
+		"success": True,
+		"error": None
+	}
+
+def transform_models(
+	pbit_file_paths: list[str],
+	transform: ModelTransform,
+	max_workers: int | None = None,
+	lazy: bool = False
+) -> list[BatchResultData]:
+	if max_workers == 1:
+		return [transform_model(path, transform, lazy) for path in pbit_file_paths]
+
+	results: list[BatchResultData] = []
+	with ProcessPoolExecutor(max_workers=max_workers) as executor:
+		futures: list[Future[BatchResultData]] = []
+		for path in pbit_file_paths:
+			futures.append(executor.submit(transform_model, path, transform, lazy))
+
+		for path, future in zip(pbit_file_paths, futures):
+			try:
+				results.append(future.result())
+			except Exception:
+				# the worker itself failed, ex: the transform could not be pickled
+				results.append({
+					"path": path,
+					"success": False,
+					"error": traceback.format_exc()
+				})
+	return results
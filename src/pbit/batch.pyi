@@ -0,0 +1,13 @@
+from .datamodelschema import DataModelSchema as DataModelSchema
+from .model import load_model as load_model, write_model as write_model
+from typing import Callable, TypedDict
+
+ModelTransform = Callable[[DataModelSchema], DataModelSchema | None]
+
+class BatchResultData(TypedDict):
+    path: str
+    success: bool
+    error: str | None
+
+def transform_model(pbit_file_path: str, transform: ModelTransform, lazy: bool = ...) -> BatchResultData: ...
+def transform_models(pbit_file_paths: list[str], transform: ModelTransform, max_workers: int | None = ..., lazy: bool = ...) -> list[BatchResultData]: ...
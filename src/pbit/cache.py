@@ -0,0 +1,112 @@
+import os
+import pickle
+import hashlib
+import zipfile
+import threading
+from collections import OrderedDict
+from tempfile import mkstemp
+from typing import Literal
+from .archive import SCHEMA_MEMBER_NAME
+from .datamodelschema import DataModelSchemaData
+
+CacheKeyMode = Literal["stat", "crc"]
+
+class ModelCache():
+	max_entries: int
+	max_bytes: int | None
+	cache_dir: str | None
+	key_mode: CacheKeyMode
+	hits: int
+	misses: int
+	_entries: OrderedDict[str, bytes]
+	_size: int
+	_lock: threading.Lock
+
+	def __init__(
+		self,
+		max_entries: int = 128,
+		max_bytes: int | None = None,
+		cache_dir: str | None = None,
+		key_mode: CacheKeyMode = "stat"
+	):
+		assert max_entries > 0, "cache needs room for at least one entry"
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.cache_dir = cache_dir
+		self.key_mode = key_mode
+		self.hits = 0
+		self.misses = 0
+		self._entries = OrderedDict()
+		self._size = 0
+		self._lock = threading.Lock()
+		if self.cache_dir != None:
+			assert self.cache_dir
+			os.makedirs(self.cache_dir, exist_ok=True)
+
+	def get_key(self, pbit_file_path: str) -> str:
+		if self.key_mode == "crc":
+			# keyed on the member itself, so identical schemas share an entry no matter the path
+			with zipfile.ZipFile(pbit_file_path, "r") as zip_ref:
+				info = zip_ref.getinfo(SCHEMA_MEMBER_NAME)
+			return f"crc:{info.CRC:08x}:{info.file_size}"
+
+		stat = os.stat(pbit_file_path)
+		return f"stat:{os.path.abspath(pbit_file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+	def get_disk_path(self, key: str) -> str:
+		assert self.cache_dir
+		return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pickle")
+
+	def _remember(self, key: str, payload: bytes):
+		with self._lock:
+			if key in self._entries:
+				self._size -= len(self._entries.pop(key))
+			self._entries[key] = payload
+			self._size += len(payload)
+			while len(self._entries) > self.max_entries or (self.max_bytes != None and self._size > self.max_bytes and len(self._entries) > 1):
+				_, evicted = self._entries.popitem(last=False)
+				self._size -= len(evicted)
+
+	def get(self, key: str) -> DataModelSchemaData | None:
+		payload: bytes | None = None
+		with self._lock:
+			if key in self._entries:
+				self._entries.move_to_end(key)
+				payload = self._entries[key]
+
+		if payload == None and self.cache_dir != None:
+			disk_path = self.get_disk_path(key)
+			if os.path.exists(disk_path):
+				with open(disk_path, "rb") as file:
+					payload = file.read()
+				self._remember(key, payload)
+
+		if payload == None:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		# every caller gets its own tree, callers are free to take ownership of it
+		assert payload
+		return pickle.loads(payload)
+
+	def put(self, key: str, data: DataModelSchemaData):
+		payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+		self._remember(key, payload)
+
+		if self.cache_dir != None:
+			disk_path = self.get_disk_path(key)
+			temp_fd, temp_path = mkstemp(dir=self.cache_dir)
+			with os.fdopen(temp_fd, "wb") as file:
+				file.write(payload)
+			os.replace(temp_path, disk_path)
+
+	def clear(self, include_disk: bool = False):
+		with self._lock:
+			self._entries = OrderedDict()
+			self._size = 0
+		if include_disk and self.cache_dir != None:
+			assert self.cache_dir
+			for file_name in os.listdir(self.cache_dir):
+				if file_name.endswith(".pickle"):
+					os.remove(os.path.join(self.cache_dir, file_name))
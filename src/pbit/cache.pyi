@@ -0,0 +1,19 @@
+from .archive import SCHEMA_MEMBER_NAME as SCHEMA_MEMBER_NAME
+from .datamodelschema import DataModelSchemaData as DataModelSchemaData
+from typing import Literal
+
+CacheKeyMode = Literal["stat", "crc"]
+
+class ModelCache:
+    max_entries: int
+    max_bytes: int | None
+    cache_dir: str | None
+    key_mode: CacheKeyMode
+    hits: int
+    misses: int
+    def __init__(self, max_entries: int = ..., max_bytes: int | None = ..., cache_dir: str | None = ..., key_mode: CacheKeyMode = ...) -> None: ...
+    def get_key(self, pbit_file_path: str) -> str: ...
+    def get_disk_path(self, key: str) -> str: ...
+    def get(self, key: str) -> DataModelSchemaData | None: ...
+    def put(self, key: str, data: DataModelSchemaData): ...
+    def clear(self, include_disk: bool = ...): ...
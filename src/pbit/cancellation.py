@@ -0,0 +1,11 @@
+import threading
+from concurrent.futures import CancelledError
+from contextvars import ContextVar
+
+ACTIVE_CANCEL_EVENT: ContextVar[threading.Event | None] = ContextVar("pbit_cancel_event", default=None)
+
+# long running work calls this between steps so a cancelled caller can stop it part way through
+def check_cancelled():
+	event = ACTIVE_CANCEL_EVENT.get()
+	if event != None and event.is_set():
+		raise CancelledError()
@@ -0,0 +1,6 @@
+import threading
+from contextvars import ContextVar
+
+ACTIVE_CANCEL_EVENT: ContextVar[threading.Event | None]
+
+def check_cancelled(): ...
@@ -1,11 +1,20 @@
 import json
-import inspect
+from io import BytesIO
+from typing import BinaryIO
 from typing import TypedDict, Literal, Any
 from uuid import uuid4
 from copy import deepcopy
+import pandas as pd
 from .typeholder import AnnotationData
 from .relationship import RelationshipData, Relationship
-from .table import TableData, Table
+from .table import TableData, Table, TableProxy
+from .patch import diff_schema, apply_patch, SchemaPatchData
+from .inference import infer_dax_types, TypeInferenceData
+from .validation import validate_schema, get_validation_message, ValidationIssueData
+from .dax import DaxGraph, DaxNode, DaxReference, get_dax_references
+from .serializer import dumps, get_json_encoder, without_none_values, with_table_fragments, StdlibJsonEncoder, OutputProfile
+from ..instrument import span
+from ..cancellation import check_cancelled
 
 class AccessOptionsData(TypedDict):
 	legacyRedirects: bool
@@ -302,21 +311,20 @@ def get_default_table() -> TableData:
 
 # write to DataModelSchema
 def remove_none_values(dct):
-	# Create a list of keys to be removed (to avoid changing dictionary size during iteration)
-	keys_to_remove = []
-	for key_val in dct:
-		value = key_val
-		key = key_val
-		if type(dct) != list and type(key_val) == str:
-			value = dct[key_val]
-
-		if value is None and type(dct) != list:
-			keys_to_remove.append(key)
-		elif inspect.isclass(value) or type(value) == list or type(value) == dict:
-			remove_none_values(value)
-	# Remove keys with None values
-	for key in keys_to_remove:
-		dct.pop(key)
+	if isinstance(dct, dict):
+		# Create a list of keys to be removed (to avoid changing dictionary size during iteration)
+		keys_to_remove = []
+		for key, value in dct.items():
+			if value is None:
+				keys_to_remove.append(key)
+			elif isinstance(value, (list, dict)):
+				remove_none_values(value)
+		for key in keys_to_remove:
+			dct.pop(key)
+	elif isinstance(dct, list):
+		for value in dct:
+			if isinstance(value, (list, dict)):
+				remove_none_values(value)
 	return dct
 
 
@@ -325,11 +333,21 @@ class DataModelSchema():
 	tables: list[Table]
 	query_groups: list[str]
 	reference_data: DataModelSchemaData
+	_tables_by_name: dict[str, Table]
+	_relationships_by_table: dict[str, list[Relationship]]
+	_relationships_by_column: dict[tuple[str, str], list[Relationship]]
+	_relationships_by_pair: dict[tuple[str, str], list[Relationship]]
+	_is_dirty: bool
 	def __init__(
 		self
 	):
+		self._is_dirty = True
 		self.relationships = []
 		self.tables = []
+		self._tables_by_name = {}
+		self._relationships_by_table = {}
+		self._relationships_by_column = {}
+		self._relationships_by_pair = {}
 		self.query_groups = []	
 		self.id = str(uuid4())
 		self.reference_data = {
@@ -378,15 +396,32 @@ class DataModelSchema():
 
 		self.reference_data["model"]["tables"].append(get_default_table())
 
+	# changes to the tables, columns, measures, partitions and relationships reach the model through their owners,
+	# the flag stays set until clear_dirty so it can tell whether anything changed since a given point
+	def mark_dirty(self):
+		self._is_dirty = True
+
+	def is_dirty(self) -> bool:
+		return self._is_dirty
+
+	def clear_dirty(self):
+		self._is_dirty = False
+
 	def clear_tables(self):
+		self.mark_dirty()
 		self.tables = []
+		self._tables_by_name = {}
 		if "model" in self.reference_data:
 			model_data = self.reference_data["model"]
 			if "tables" in model_data:
 				model_data["tables"] = []
 
 	def clear_relationships(self): 
+		self.mark_dirty()
 		self.relationships = []
+		self._relationships_by_table = {}
+		self._relationships_by_column = {}
+		self._relationships_by_pair = {}
 		if "model" in self.reference_data:
 
 			model_data = self.reference_data["model"]
@@ -394,6 +429,7 @@ class DataModelSchema():
 				model_data["relationships"] = []
 
 	def clear_query_groups(self):
+		self.mark_dirty()
 		self.query_groups = []
 		if "model" in self.reference_data:
 			model_data = self.reference_data["model"]
@@ -405,16 +441,107 @@ class DataModelSchema():
 		self.clear_relationships()
 		self.clear_query_groups()			
 
-	def get_table_by_name(self, name: str) -> Table:
-		final_table: Table | None
+	def _rename_table(self, table: Table, old_name: str, new_name: str):
+		self.mark_dirty()
+		if self._tables_by_name.get(old_name) is table:
+			del self._tables_by_name[old_name]
+			# another table may still go by the old name, proxies answer this without loading
+			for other in self.tables:
+				if other.name == old_name:
+					self._tables_by_name[old_name] = other
+					break
+		self._tables_by_name.setdefault(new_name, table)
+
+	def _get_relationship_keys(self, relationship: Relationship) -> tuple[list[str], list[tuple[str, str]], tuple[str, str]]:
+		from_table = relationship.from_table
+		to_table = relationship.to_table
+		table_keys = [from_table]
+		if to_table != from_table:
+			table_keys.append(to_table)
+		column_keys = [(from_table, relationship.from_column)]
+		if column_keys[0] != (to_table, relationship.to_column):
+			column_keys.append((to_table, relationship.to_column))
+		pair_key = (from_table, to_table) if from_table <= to_table else (to_table, from_table)
+		return table_keys, column_keys, pair_key
+
+	def _index_relationship(self, relationship: Relationship):
+		table_keys, column_keys, pair_key = self._get_relationship_keys(relationship)
+		for table_key in table_keys:
+			self._relationships_by_table.setdefault(table_key, []).append(relationship)
+		for column_key in column_keys:
+			self._relationships_by_column.setdefault(column_key, []).append(relationship)
+		self._relationships_by_pair.setdefault(pair_key, []).append(relationship)
+
+	def _unindex_relationship(self, relationship: Relationship):
+		table_keys, column_keys, pair_key = self._get_relationship_keys(relationship)
+		for index, keys in [
+			(self._relationships_by_table, table_keys),
+			(self._relationships_by_column, column_keys),
+			(self._relationships_by_pair, [pair_key]),
+		]:
+			for key in keys:
+				entries = index[key]
+				for i, entry in enumerate(entries):
+					if entry is relationship:
+						del entries[i]
+						break
+				if len(entries) == 0:
+					del index[key]
+
+	def _add_relationship(self, relationship: Relationship):
+		self.mark_dirty()
+		relationship._owner = self
+		self.relationships.append(relationship)
+		self._index_relationship(relationship)
+
+	def reindex(self):
+		self.mark_dirty()
+		self._tables_by_name = {}
 		for table in self.tables:
-			if table.name == name:
-				final_table = table
-				break
-		assert final_table, f"table {name} does not exist"
+			# setting it through a proxy would load its table and hand the table the model as its owner
+			if isinstance(table, TableProxy):
+				object.__setattr__(table, "_owner", self)
+			else:
+				table._owner = self
+			self._tables_by_name.setdefault(table.name, table)
+
+		self._relationships_by_table = {}
+		self._relationships_by_column = {}
+		self._relationships_by_pair = {}
+		for relationship in self.relationships:
+			relationship._owner = self
+			self._index_relationship(relationship)
+
+	def get_if_table_exists(self, name: str) -> bool:
+		table = self._tables_by_name.get(name)
+		return table != None and table.name == name
+
+	def get_table_by_name(self, name: str) -> Table:
+		final_table: Table | None = self._tables_by_name.get(name)
+		assert final_table and final_table.name == name, f"table {name} does not exist"
 		return final_table
 	
+	def get_if_relationship_exists(self, table_a: str, table_b: str) -> bool:
+		pair_key = (table_a, table_b) if table_a <= table_b else (table_b, table_a)
+		return pair_key in self._relationships_by_pair
+
+	def get_relationships_by_table(self, table_name: str) -> list[Relationship]:
+		return list(self._relationships_by_table.get(table_name, []))
+
+	def get_relationships_by_column(self, table_name: str, column_name: str) -> list[Relationship]:
+		return list(self._relationships_by_column.get((table_name, column_name), []))
+
+	def get_neighbor_tables(self, table_name: str) -> list[str]:
+		neighbors: dict[str, None] = {}
+		for relationship in self._relationships_by_table.get(table_name, []):
+			if relationship.from_table == table_name:
+				neighbors[relationship.to_table] = None
+			if relationship.to_table == table_name:
+				neighbors[relationship.from_table] = None
+		return list(neighbors.keys())
+
 	def insert_query_group(self, group_name: str):
+		self.mark_dirty()
 		self.query_groups.append(group_name)
 
 	def new_relationship(
@@ -428,27 +555,40 @@ class DataModelSchema():
 		if to_column == "":
 			to_column = from_column
 
-		is_safe = True
-		for relationship in self.relationships:
-			if relationship.from_table == from_table and relationship.to_table == to_table:
-				is_safe = False
-			elif relationship.to_table == from_table and relationship.from_table == to_table:
-				is_safe = False
+		is_safe = not self.get_if_relationship_exists(from_table, to_table)
 
 		assert is_safe == True, f"there's already an active relationship between table {from_table} and {to_table}"
 			
 		relationship = Relationship(from_table, from_column, to_table, to_column)
-		self.relationships.append(relationship)
+		self._add_relationship(relationship)
 
 		return relationship
 
 	def new_table(self, name: str) -> Table:
+		self.mark_dirty()
 		table = Table(name)
+		table._owner = self
 		self.tables.append(table)
+		self._tables_by_name.setdefault(name, table)
 		return table
 
-	def load(self, schema_data: DataModelSchemaData):
-		self.reference_data = deepcopy(schema_data)
+	def new_table_from_dataframe(
+		self,
+		name: str,
+		df: pd.DataFrame,
+		relative_json_path: str | None = None,
+		group_name: str | None = None
+	) -> Table:
+		table = self.new_table(name)
+		table.bind_to_dataframe(df, relative_json_path, group_name)
+		return table
+
+	def load(self, schema_data: DataModelSchemaData, lazy: bool = False, copy: bool = True):
+		self.mark_dirty()
+		if copy:
+			self.reference_data = deepcopy(schema_data)
+		else:
+			self.reference_data = schema_data
 		
 		# print(json.dumps(self.reference_data, indent=4))
 
@@ -464,22 +604,33 @@ class DataModelSchema():
 		self.relationships = []
 		self.tables = []
 		self.query_groups = []
+		self._tables_by_name = {}
+		self._relationships_by_table = {}
+		self._relationships_by_column = {}
+		self._relationships_by_pair = {}
 
 		if "relationships" in ref_model_data:
 			rel_list = ref_model_data["relationships"]
 			assert rel_list != None
 			for relationship_data in rel_list:
-				relationship = self.new_relationship("", "", "")
-				relationship.load(relationship_data)
+				relationship = Relationship("", "", "", "")
+				relationship.load(relationship_data, copy=False)
+				self._add_relationship(relationship)
 			ref_model_data["relationships"] = []
 
 		if "tables" in ref_model_data:
 			tab_list = ref_model_data["tables"]
 			assert tab_list != None
-			for i , table_data in enumerate(tab_list):
-				table = self.new_table("")
-				table.load(table_data)
-			# ref_model_data["tables"] = [get_default_table()]
+			if lazy:
+				for table_data in tab_list:
+					table_proxy: Any = TableProxy(table_data, self)
+					self.tables.append(table_proxy)
+					self._tables_by_name.setdefault(table_proxy.name, table_proxy)
+			else:
+				for i , table_data in enumerate(tab_list):
+					table = self.new_table("")
+					table.load(table_data, copy=False)
+			ref_model_data["tables"] = []
 
 		if "queryGroups" in ref_model_data and ref_model_data["queryGroups"] != None:
 			ref_groups = ref_model_data["queryGroups"]
@@ -488,14 +639,21 @@ class DataModelSchema():
 				self.query_groups.append(query_group_data["folder"])
 			ref_model_data["queryGroups"] = None
 
-	def dump(self) -> DataModelSchemaData:
-		data_model_schema = deepcopy(self.reference_data)
+	def get_dax_graph(self, use_cache: bool = False) -> DaxGraph:
+		return DaxGraph.from_schema_data(self.dump(remove_none=False, use_cache=use_cache))
+
+	def validate(self, use_cache: bool = False) -> list[ValidationIssueData]:
+		return validate_schema(self.dump(remove_none=False, use_cache=use_cache))
+
+	def dump(self, remove_none: bool = True, use_cache: bool = False) -> DataModelSchemaData:
+		data_model_schema = self.reference_data.copy()
 
 		model_data: ModelData | None = None
 	
 		untyped_ref: Any = data_model_schema
 		untyped_ref["name"] = self.id
-		untyped_ref_data = untyped_ref["model"]
+		untyped_ref_data = untyped_ref["model"].copy()
+		untyped_ref["model"] = untyped_ref_data
 		dict_mod_data: ModelData = untyped_ref_data
 		model_data = dict_mod_data
 
@@ -503,6 +661,8 @@ class DataModelSchema():
 
 		if not "dataAccessOptions" in model_data:
 			model_data["dataAccessOptions"] = {}
+		else:
+			model_data["dataAccessOptions"] = model_data["dataAccessOptions"].copy()
 
 		model_data["dataAccessOptions"]["legacyRedirects"] = True
 		model_data["dataAccessOptions"]["returnErrorValuesAsNull"] = True
@@ -527,7 +687,7 @@ class DataModelSchema():
 		table_list = []
 
 		for table in self.tables:
-			table_list.append(table.dump())
+			table_list.append(table.dump(use_cache))
 
 		if len(table_list) > 0 or "tables" in model_data:
 			model_data["tables"] = table_list
@@ -535,18 +695,62 @@ class DataModelSchema():
 		relationship_list = []
 
 		for relationship in self.relationships:
-			relationship_list.append(relationship.dump())
+			relationship_list.append(relationship.dump(use_cache))
 
 		if len(relationship_list) > 0 or "relationships" in model_data:
 			model_data["relationships"] = relationship_list
 
-		return remove_none_values(data_model_schema)
-
-def write(schema_file_path: str, data: DataModelSchemaData):
-	file = open(schema_file_path, "w", encoding="utf-16-le")
-	file.write(json.dumps(data, indent=4))
-	file.close()
+		if remove_none:
+			if use_cache:
+				# cached fragments are shared with later dumps, so they can't be stripped in place
+				return without_none_values(data_model_schema)
+			return remove_none_values(data_model_schema)
+		return data_model_schema
+
+def encode(
+	data: DataModelSchemaData,
+	skip_none: bool = False,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	max_workers: int | None = 1
+) -> bytes:
+	buffer = BytesIO()
+	write_stream(buffer, data, skip_none, profile, encoder, max_workers)
+	return buffer.getvalue()
+
+def decode(data: bytes | memoryview) -> DataModelSchemaData:
+	with span("decode", bytes=len(data)):
+		text = str(data, "utf-16-le")
+	check_cancelled()
+	with span("parse", chars=len(text)):
+		return json.loads(text)
+
+def write_stream(
+	fp: BinaryIO,
+	data: DataModelSchemaData,
+	skip_none: bool = False,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	max_workers: int | None = 1
+):
+	json_encoder = get_json_encoder(encoder)
+	# only indented output from the stdlib encoder gains from splitting tables across processes, max_workers=1 keeps it serial
+	if max_workers != 1 and isinstance(json_encoder, StdlibJsonEncoder):
+		data = with_table_fragments(data, profile, skip_none, max_workers)
+	json_encoder.write(data, fp, profile, skip_none, "utf-16-le")
+
+def write(
+	schema_file_path: str,
+	data: DataModelSchemaData,
+	skip_none: bool = False,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	max_workers: int | None = 1
+):
+	with open(schema_file_path, "wb") as file:
+		write_stream(file, data, skip_none, profile, encoder, max_workers)
 
 def read(schema_file_path: str) -> DataModelSchema:
-	return json.loads(open(schema_file_path, "r", encoding="utf-16-le").read())
+	with open(schema_file_path, "r", encoding="utf-16-le") as file:
+		return json.loads(file.read())
 
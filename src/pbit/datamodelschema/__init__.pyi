@@ -1,8 +1,14 @@
 from .relationship import Relationship as Relationship, RelationshipData as RelationshipData
-from .table import Table as Table, TableData as TableData
+from .table import Table as Table, TableData as TableData, TableProxy as TableProxy
+from .patch import SchemaPatchData as SchemaPatchData, apply_patch as apply_patch, diff_schema as diff_schema
+from .inference import TypeInferenceData as TypeInferenceData, infer_dax_types as infer_dax_types
+from .dax import DaxGraph as DaxGraph, DaxNode as DaxNode, DaxReference as DaxReference, get_dax_references as get_dax_references
+from .validation import ValidationIssueData as ValidationIssueData, get_validation_message as get_validation_message, validate_schema as validate_schema
+from .serializer import OutputProfile as OutputProfile, dumps as dumps, get_json_encoder as get_json_encoder, without_none_values as without_none_values
 from .typeholder import AnnotationData as AnnotationData
 from _typeshed import Incomplete
-from typing import TypedDict
+from pandas import DataFrame
+from typing import BinaryIO, TypedDict
 
 class AccessOptionsData(TypedDict):
     legacyRedirects: bool
@@ -51,16 +57,31 @@ class DataModelSchema:
     reference_data: DataModelSchemaData
     id: Incomplete
     def __init__(self) -> None: ...
+    def mark_dirty(self) -> None: ...
+    def is_dirty(self) -> bool: ...
+    def clear_dirty(self) -> None: ...
     def clear_tables(self) -> None: ...
     def clear_relationships(self) -> None: ...
     def clear_query_groups(self) -> None: ...
     def clear(self) -> None: ...
+    def reindex(self) -> None: ...
+    def get_if_table_exists(self, name: str) -> bool: ...
     def get_table_by_name(self, name: str) -> Table: ...
+    def get_if_relationship_exists(self, table_a: str, table_b: str) -> bool: ...
+    def get_relationships_by_table(self, table_name: str) -> list[Relationship]: ...
+    def get_relationships_by_column(self, table_name: str, column_name: str) -> list[Relationship]: ...
+    def get_neighbor_tables(self, table_name: str) -> list[str]: ...
     def insert_query_group(self, group_name: str): ...
     def new_relationship(self, from_table: str, from_column: str, to_table: str, to_column: str = ...) -> Relationship: ...
     def new_table(self, name: str) -> Table: ...
-    def load(self, schema_data: DataModelSchemaData): ...
-    def dump(self) -> DataModelSchemaData: ...
+    def new_table_from_dataframe(self, name: str, df: DataFrame, relative_json_path: str | None = ..., group_name: str | None = ...) -> Table: ...
+    def load(self, schema_data: DataModelSchemaData, lazy: bool = ..., copy: bool = ...): ...
+    def get_dax_graph(self, use_cache: bool = ...) -> DaxGraph: ...
+    def validate(self, use_cache: bool = ...) -> list[ValidationIssueData]: ...
+    def dump(self, remove_none: bool = ..., use_cache: bool = ...) -> DataModelSchemaData: ...
 
-def write(schema_file_path: str, data: DataModelSchemaData): ...
+def encode(data: DataModelSchemaData, skip_none: bool = ..., profile: OutputProfile = ..., encoder: str = ..., max_workers: int | None = ...) -> bytes: ...
+def decode(data: bytes | memoryview) -> DataModelSchemaData: ...
+def write_stream(fp: BinaryIO, data: DataModelSchemaData, skip_none: bool = ..., profile: OutputProfile = ..., encoder: str = ..., max_workers: int | None = ...): ...
+def write(schema_file_path: str, data: DataModelSchemaData, skip_none: bool = ..., profile: OutputProfile = ..., encoder: str = ..., max_workers: int | None = ...): ...
 def read(schema_file_path: str) -> DataModelSchema: ...
@@ -1,8 +1,9 @@
 from typing import TypedDict, Literal, Any
 from uuid import uuid4
 from copy import deepcopy
-from .dax import DaxType
-from .typeholder import AnnotationData
+from .dax import DaxType, DaxReference, get_dax_references, get_dax_expression_text
+from .typeholder import AnnotationData, ReadOnlyDict, intern_fields, intern_annotations
+from .tracking import Tracked
 
 SummaryType = Literal["sum"]
 
@@ -29,12 +30,71 @@ class ColumnData(TypedDict):
 	attributeHierarchy: ColumnAttributeHierarchyData
 	annotations: list[AnnotationData] | None
 
-class Column():
-	name: str
+# shared by every column that doesn't change them, they're read only and copied out in reference_data and dump
+DEFAULT_ATTRIBUTE_HIERARCHY: ColumnAttributeHierarchyData = ReadOnlyDict({
+	"state": "ready"
+})
+
+DEFAULT_COLUMN_ANNOTATIONS: tuple[AnnotationData, ...] = (
+	ReadOnlyDict({
+		"name": "SummarizationSetBy",
+		"value": "Automatic"
+	}),
+)
+
+# what a new column dumps as, name, dataType, sourceColumn and lineageTag are filled in from the column
+NEW_COLUMN_DATA: ColumnData = {
+	"formatString": None,
+	"dataCategory": None,
+	"isNameInferred": None,
+	"expression": None,
+	"isDataTypeInferred": None,
+	"sortByColumn": None,
+	"type": None,
+	"isHidden": None,
+	"isUnique": None,
+	"isKey": None,
+	"isNullable": None,
+	"name": "",
+	"dataType": "",
+	"sourceColumn": None,
+	"lineageTag": None,
+	"summarizeBy": "none",
+	"attributeHierarchy": DEFAULT_ATTRIBUTE_HIERARCHY,
+	"annotations": DEFAULT_COLUMN_ANNOTATIONS
+}
+
+INTERNED_COLUMN_FIELDS: tuple[str, ...] = ("type", "dataType", "summarizeBy", "dataCategory", "formatString")
+
+def compact_column_data(data: ColumnData):
+	untyped_data: Any = data
+	intern_fields(untyped_data, INTERNED_COLUMN_FIELDS)
+	if untyped_data.get("attributeHierarchy") == DEFAULT_ATTRIBUTE_HIERARCHY:
+		untyped_data["attributeHierarchy"] = DEFAULT_ATTRIBUTE_HIERARCHY
+	annotations = untyped_data.get("annotations")
+	if isinstance(annotations, list) and len(annotations) == 1 and annotations[0] == DEFAULT_COLUMN_ANNOTATIONS[0]:
+		untyped_data["annotations"] = DEFAULT_COLUMN_ANNOTATIONS
+	else:
+		intern_annotations(annotations)
+
+# swaps the shared read only defaults for copies of their own, so the data can be edited or handed out
+def expand_column_data(data: ColumnData):
+	untyped_data: Any = data
+	attribute_hierarchy = untyped_data.get("attributeHierarchy")
+	if isinstance(attribute_hierarchy, ReadOnlyDict):
+		untyped_data["attributeHierarchy"] = dict(attribute_hierarchy)
+	annotations = untyped_data.get("annotations")
+	if isinstance(annotations, tuple):
+		untyped_data["annotations"] = [dict(annotation) for annotation in annotations]
+
+class Column(Tracked):
+	__slots__ = ("id", "data_type", "source_column", "_reference_data", "_name")
 	id: str
 	data_type: str
 	source_column: str | None
-	reference_data: ColumnData
+	_reference_data: ColumnData | None
+	_name: str
+	_owner: Any
 
 	def __init__(
 		self,
@@ -42,37 +102,41 @@ class Column():
 		dataType: str,
 		source_column: str | None = None
 	):
-		self.name = name
+		self._owner = None
+		self._name = name
 		self.id = str(uuid4())
 		self.data_type = dataType
 		self.source_column = source_column
-		self.reference_data: ColumnData = {
-			"formatString": None,
-			"dataCategory": None,
-			"isNameInferred": None,
-			"expression": None,
-			"isDataTypeInferred": None,
-			"sortByColumn": None,
-			"type": None,
-			"isHidden": None,
-			"isUnique": None,
-			"isKey": None,
-			"isNullable": None,
-			"name": self.name,
-			"dataType": self.data_type,
-			"sourceColumn": self.source_column,
-			"lineageTag": self.id,
-			"summarizeBy": "none",
-			"attributeHierarchy": {
-				"state": "ready"
-			},
-			"annotations": [
-				{
-					"name": "SummarizationSetBy",
-					"value": "Automatic"
-				}
-			]
-		}
+		self._reference_data = None
+
+	# new columns only hold what differs from NEW_COLUMN_DATA until their reference data is asked for
+	@property
+	def reference_data(self) -> ColumnData:
+		if self._reference_data == None:
+			reference_data = NEW_COLUMN_DATA.copy()
+			reference_data["name"] = self.name
+			reference_data["dataType"] = self.data_type
+			reference_data["sourceColumn"] = self.source_column
+			reference_data["lineageTag"] = self.id
+			self._reference_data = reference_data
+		assert self._reference_data != None
+		expand_column_data(self._reference_data)
+		return self._reference_data
+
+	@reference_data.setter
+	def reference_data(self, reference_data: ColumnData):
+		self._reference_data = reference_data
+
+	@property
+	def name(self) -> str:
+		return self._name
+
+	@name.setter
+	def name(self, name: str):
+		old_name = self._name
+		self._name = name
+		if self._owner != None and old_name != name:
+			self._owner._rename_column(self, old_name, name)
 
 	def set_as_bin(self, target_table_name: str, target_column_name: str, increment: float, bin_name: str, data_type: DaxType="double"):
 
@@ -143,7 +207,7 @@ class Column():
 				}
 			]
 		}
-		self.load(reference_data)
+		self.load(reference_data, copy=False)
 
 	def set_as_normalized(
 		self,
@@ -185,24 +249,40 @@ class Column():
               }
             ]
           }
-		self.load(ref_data)
-
-	def load(self, data: ColumnData):
-		self.reference_data = deepcopy(data)
-		self.name = self.reference_data["name"]
-		self.data_type = self.reference_data["dataType"]
-		if "sourceColumn" in self.reference_data:
-			source_column_ref = self.reference_data["sourceColumn"]
+		self.load(ref_data, copy=False)
+
+	def get_dax_references(self) -> tuple[DaxReference, ...]:
+		if self._reference_data == None or self._reference_data.get("expression") == None:
+			return ()
+		return get_dax_references(get_dax_expression_text(self._reference_data["expression"]))
+
+	def load(self, data: ColumnData, copy: bool = True):
+		if copy:
+			self.reference_data = deepcopy(data)
+		else:
+			self.reference_data = data
+		reference_data = self._reference_data
+		assert reference_data != None
+		compact_column_data(reference_data)
+		self.name = reference_data["name"]
+		self.data_type = reference_data["dataType"]
+		if "sourceColumn" in reference_data:
+			source_column_ref = reference_data["sourceColumn"]
 			assert source_column_ref
 			self.source_column = source_column_ref
 		
-		if "lineageTag" in self.reference_data:
-			lin_tag = self.reference_data["lineageTag"]
+		if "lineageTag" in reference_data:
+			lin_tag = reference_data["lineageTag"]
 			assert lin_tag
 			self.id = lin_tag
 
-	def dump(self) -> ColumnData:
-		column_data: ColumnData = deepcopy(self.reference_data)
+	def dump(self, use_cache: bool = False) -> ColumnData:
+		if use_cache and self._dump_cache != None:
+			return self._dump_cache
+		if self._reference_data == None:
+			column_data: ColumnData = NEW_COLUMN_DATA.copy()
+		else:
+			column_data = self._reference_data.copy()
 		column_data["name"] = self.name
 		column_data["dataType"] = self.data_type
 		if column_data["dataType"] == "any":
@@ -210,5 +290,8 @@ class Column():
 
 		column_data["sourceColumn"] = self.source_column
 		column_data["lineageTag"] = self.id
+		expand_column_data(column_data)
 
+		if use_cache:
+			self._dump_cache = column_data
 		return column_data
@@ -1,5 +1,6 @@
-from .dax import DaxType as DaxType
-from .typeholder import AnnotationData as AnnotationData
+from .dax import DaxReference as DaxReference, DaxType as DaxType, get_dax_expression_text as get_dax_expression_text, get_dax_references as get_dax_references
+from .typeholder import AnnotationData as AnnotationData, ReadOnlyDict as ReadOnlyDict, intern_annotations as intern_annotations, intern_fields as intern_fields
+from .tracking import Tracked as Tracked
 from _typeshed import Incomplete
 from typing import TypedDict
 
@@ -28,15 +29,30 @@ class ColumnData(TypedDict):
     attributeHierarchy: ColumnAttributeHierarchyData
     annotations: list[AnnotationData] | None
 
-class Column:
-    name: str
+DEFAULT_ATTRIBUTE_HIERARCHY: ColumnAttributeHierarchyData
+DEFAULT_COLUMN_ANNOTATIONS: tuple[AnnotationData, ...]
+NEW_COLUMN_DATA: ColumnData
+INTERNED_COLUMN_FIELDS: tuple[str, ...]
+
+def compact_column_data(data: ColumnData): ...
+def expand_column_data(data: ColumnData): ...
+
+class Column(Tracked):
     id: str
     data_type: str
     source_column: str | None
-    reference_data: ColumnData
     def __init__(self, name: str, dataType: str, source_column: str | None = ...) -> None: ...
+    @property
+    def reference_data(self) -> ColumnData: ...
+    @reference_data.setter
+    def reference_data(self, reference_data: ColumnData): ...
+    @property
+    def name(self) -> str: ...
+    @name.setter
+    def name(self, name: str): ...
     def set_as_bin(self, target_table_name: str, target_column_name: str, increment: float, bin_name: str, data_type: DaxType = ...): ...
     def set_as_normalized(self, numerator_table_name: str, numerator_column_name: str, denominator_table_name: str, denominator_column_name: str, name: str, data_type: DaxType = ..., summarize_by: SummaryType = ...): ...
     def set_dax(self, dax: str, name: str, data_type: DaxType = ..., summarize_by: SummaryType = ...): ...
-    def load(self, data: ColumnData): ...
-    def dump(self) -> ColumnData: ...
+    def get_dax_references(self) -> tuple[DaxReference, ...]: ...
+    def load(self, data: ColumnData, copy: bool = ...): ...
+    def dump(self, use_cache: bool = ...) -> ColumnData: ...
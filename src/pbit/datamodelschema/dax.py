@@ -1,3 +1,263 @@
-from typing import TypedDict, Literal, Any
+from typing import TypedDict, Literal, Iterator, Any
+from functools import lru_cache
+from collections import deque
 
 DaxType = Literal["string","boolean","dateTime","double","int64", "any"]
+
+DAX_REFERENCE_CACHE_SIZE: int = 16 * 1024
+
+# table and name of a reference, a bare table has no name and a bare [name] has no table, the flag is set inside RELATED
+DaxReference = tuple[str | None, str | None, bool]
+
+DaxNodeKind = Literal["table", "column", "measure"]
+
+# tables use an empty name
+DaxNode = tuple[DaxNodeKind, str, str]
+
+RELATED_FUNCTIONS: list[str] = ["RELATED", "RELATEDTABLE"]
+
+def get_dax_quoted_end(text: str, start: int, quote: str) -> int:
+	i = start + 1
+	length = len(text)
+	while i < length:
+		if text[i] == quote:
+			if i + 1 < length and text[i + 1] == quote:
+				i += 2
+				continue
+			return i + 1
+		i += 1
+	return length
+
+def skip_dax_whitespace(text: str, i: int) -> int:
+	length = len(text)
+	while i < length and text[i].isspace():
+		i += 1
+	return i
+
+@lru_cache(maxsize=DAX_REFERENCE_CACHE_SIZE)
+def get_dax_references(expression: str) -> tuple[DaxReference, ...]:
+	references: list[DaxReference] = []
+	functions: list[str] = []
+	related_depth = 0
+	i = 0
+	length = len(expression)
+	while i < length:
+		char = expression[i]
+		if char == "\"":
+			i = get_dax_quoted_end(expression, i, "\"")
+		elif expression.startswith("//", i) or expression.startswith("--", i):
+			end = expression.find("\n", i)
+			i = length if end == -1 else end + 1
+		elif expression.startswith("/*", i):
+			end = expression.find("*/", i + 2)
+			i = length if end == -1 else end + 2
+		elif char == "[":
+			end = get_dax_quoted_end(expression, i, "]")
+			references.append((None, expression[i+1:end-1].replace("]]", "]"), related_depth > 0))
+			i = end
+		elif char == "'" or char.isalpha() or char == "_":
+			if char == "'":
+				end = get_dax_quoted_end(expression, i, "'")
+				word = expression[i+1:end-1].replace("''", "'")
+			else:
+				end = i + 1
+				while end < length and (expression[end].isalnum() or expression[end] == "_" or expression[end] == "."):
+					end += 1
+				word = expression[i:end]
+			next_i = skip_dax_whitespace(expression, end)
+			if next_i < length and expression[next_i] == "[":
+				name_end = get_dax_quoted_end(expression, next_i, "]")
+				references.append((word, expression[next_i+1:name_end-1].replace("]]", "]"), related_depth > 0))
+				i = name_end
+			elif next_i < length and expression[next_i] == "(" and char != "'":
+				function_name = word.upper()
+				functions.append(function_name)
+				if function_name in RELATED_FUNCTIONS:
+					related_depth += 1
+				i = next_i + 1
+			else:
+				references.append((word, None, related_depth > 0))
+				i = end
+		elif char.isdigit():
+			i += 1
+			while i < length and (expression[i].isalnum() or expression[i] == "."):
+				i += 1
+		elif char == "(":
+			functions.append("")
+			i += 1
+		elif char == ")":
+			if len(functions) > 0 and functions.pop() in RELATED_FUNCTIONS:
+				related_depth -= 1
+			i += 1
+		else:
+			i += 1
+	return tuple(references)
+
+def get_dax_expression_text(expression: Any) -> str:
+	if isinstance(expression, list):
+		return "\n".join(expression)
+	return expression
+
+class DaxGraph():
+	dependencies: dict[DaxNode, set[DaxNode]]
+	dependents: dict[DaxNode, set[DaxNode]]
+	missing: dict[DaxNode, list[DaxReference]]
+
+	def __init__(self):
+		self.dependencies = {}
+		self.dependents = {}
+		self.missing = {}
+
+	def add_node(self, node: DaxNode):
+		if not node in self.dependencies:
+			self.dependencies[node] = set()
+			self.dependents[node] = set()
+
+	def add_edge(self, node: DaxNode, dependency: DaxNode):
+		self.add_node(node)
+		self.add_node(dependency)
+		self.dependencies[node].add(dependency)
+		self.dependents[dependency].add(node)
+
+	# bare [name] is a measure if the model has one by that name, otherwise a column of the table it's written in
+	@classmethod
+	def from_schema_data(cls, schema_data: Any) -> "DaxGraph":
+		graph = cls()
+		tables = (schema_data.get("model") or {}).get("tables") or []
+		columns_by_table: dict[str, set[str]] = {}
+		measure_tables: dict[str, str] = {}
+		expressions: list[tuple[DaxNode, str, str]] = []
+
+		for table in tables:
+			table_name = table["name"]
+			table_node: DaxNode = ("table", table_name, "")
+			graph.add_node(table_node)
+			column_names: set[str] = set()
+			for column in table.get("columns") or []:
+				column_node: DaxNode = ("column", table_name, column["name"])
+				column_names.add(column["name"])
+				graph.add_edge(column_node, table_node)
+				if column.get("expression") != None:
+					expressions.append((column_node, table_name, get_dax_expression_text(column["expression"])))
+			columns_by_table[table_name] = column_names
+
+			for measure in table.get("measures") or []:
+				measure_node: DaxNode = ("measure", table_name, measure["name"])
+				measure_tables.setdefault(measure["name"], table_name)
+				graph.add_edge(measure_node, table_node)
+				if measure.get("expression") != None:
+					expressions.append((measure_node, table_name, get_dax_expression_text(measure["expression"])))
+
+			for partition in table.get("partitions") or []:
+				source = partition.get("source") or {}
+				if source.get("type") == "calculated" and source.get("expression") != None:
+					expressions.append((table_node, table_name, get_dax_expression_text(source["expression"])))
+
+		for node, home_table, expression in expressions:
+			for reference in get_dax_references(expression):
+				table_name, name, _ = reference
+				dependency: DaxNode | None = None
+				if name == None:
+					if table_name in columns_by_table:
+						dependency = ("table", table_name, "")
+					else:
+						# bare words are also functions, variables and keywords, so only table names count
+						continue
+				elif table_name == None:
+					if name in measure_tables:
+						dependency = ("measure", measure_tables[name], name)
+					elif name in columns_by_table.get(home_table, set()):
+						dependency = ("column", home_table, name)
+				elif table_name in columns_by_table:
+					if name in columns_by_table[table_name]:
+						dependency = ("column", table_name, name)
+					elif measure_tables.get(name) == table_name:
+						dependency = ("measure", table_name, name)
+
+				if dependency == None:
+					graph.missing.setdefault(node, []).append(reference)
+				else:
+					assert dependency
+					graph.add_edge(node, dependency)
+		return graph
+
+	def get_dependencies(self, node: DaxNode) -> set[DaxNode]:
+		return self.dependencies.get(node, set())
+
+	def get_dependents(self, node: DaxNode) -> set[DaxNode]:
+		return self.dependents.get(node, set())
+
+	# everything that directly or indirectly depends on the node, in the order it's reached
+	def get_impacted(self, node: DaxNode) -> list[DaxNode]:
+		impacted: list[DaxNode] = []
+		seen: set[DaxNode] = {node}
+		queue: deque[DaxNode] = deque([node])
+		while len(queue) > 0:
+			for dependent in self.get_dependents(queue.popleft()):
+				if not dependent in seen:
+					seen.add(dependent)
+					impacted.append(dependent)
+					queue.append(dependent)
+		return impacted
+
+	# dependencies come before the nodes that use them, nodes on a cycle are left out
+	def get_topological_order(self) -> list[DaxNode]:
+		remaining: dict[DaxNode, int] = {node: len(dependencies) for node, dependencies in self.dependencies.items()}
+		queue: deque[DaxNode] = deque(node for node, count in remaining.items() if count == 0)
+		order: list[DaxNode] = []
+		while len(queue) > 0:
+			node = queue.popleft()
+			order.append(node)
+			for dependent in self.dependents[node]:
+				remaining[dependent] -= 1
+				if remaining[dependent] == 0:
+					queue.append(dependent)
+		return order
+
+	# strongly connected components with more than one node, or a node that references itself
+	def get_cycles(self) -> list[list[DaxNode]]:
+		indexes: dict[DaxNode, int] = {}
+		low_links: dict[DaxNode, int] = {}
+		stack: list[DaxNode] = []
+		on_stack: set[DaxNode] = set()
+		cycles: list[list[DaxNode]] = []
+
+		for root in self.dependencies:
+			if root in indexes:
+				continue
+			# iterative tarjan, each frame is a node and an iterator over its dependencies
+			work: list[tuple[DaxNode, Iterator[DaxNode]]] = []
+			indexes[root] = low_links[root] = len(indexes)
+			stack.append(root)
+			on_stack.add(root)
+			work.append((root, iter(self.dependencies[root])))
+			while len(work) > 0:
+				node, dependencies = work[-1]
+				dependency = next(dependencies, None)
+				if dependency != None:
+					assert dependency
+					if not dependency in indexes:
+						indexes[dependency] = low_links[dependency] = len(indexes)
+						stack.append(dependency)
+						on_stack.add(dependency)
+						work.append((dependency, iter(self.dependencies[dependency])))
+					elif dependency in on_stack:
+						low_links[node] = min(low_links[node], indexes[dependency])
+					continue
+
+				work.pop()
+				if len(work) > 0:
+					parent = work[-1][0]
+					low_links[parent] = min(low_links[parent], low_links[node])
+				if low_links[node] == indexes[node]:
+					component: list[DaxNode] = []
+					while True:
+						member = stack.pop()
+						on_stack.remove(member)
+						component.append(member)
+						if member == node:
+							break
+					if len(component) > 1 or node in self.dependencies[node]:
+						component.reverse()
+						cycles.append(component)
+		return cycles
@@ -1,3 +1,29 @@
-from _typeshed import Incomplete
+from typing import Any, Literal
 
-DaxType: Incomplete
+DaxType = Literal["string", "boolean", "dateTime", "double", "int64", "any"]
+
+DAX_REFERENCE_CACHE_SIZE: int
+DaxReference = tuple[str | None, str | None, bool]
+DaxNodeKind = Literal["table", "column", "measure"]
+DaxNode = tuple[DaxNodeKind, str, str]
+RELATED_FUNCTIONS: list[str]
+
+def get_dax_quoted_end(text: str, start: int, quote: str) -> int: ...
+def skip_dax_whitespace(text: str, i: int) -> int: ...
+def get_dax_references(expression: str) -> tuple[DaxReference, ...]: ...
+def get_dax_expression_text(expression: Any) -> str: ...
+
+class DaxGraph:
+    dependencies: dict[DaxNode, set[DaxNode]]
+    dependents: dict[DaxNode, set[DaxNode]]
+    missing: dict[DaxNode, list[DaxReference]]
+    def __init__(self) -> None: ...
+    def add_node(self, node: DaxNode): ...
+    def add_edge(self, node: DaxNode, dependency: DaxNode): ...
+    @classmethod
+    def from_schema_data(cls, schema_data: Any) -> DaxGraph: ...
+    def get_dependencies(self, node: DaxNode) -> set[DaxNode]: ...
+    def get_dependents(self, node: DaxNode) -> set[DaxNode]: ...
+    def get_impacted(self, node: DaxNode) -> list[DaxNode]: ...
+    def get_topological_order(self) -> list[DaxNode]: ...
+    def get_cycles(self) -> list[list[DaxNode]]: ...
@@ -0,0 +1,127 @@
+import re
+import json
+from typing import TypedDict, Iterator, TextIO, Any
+from .dax import DaxType
+
+INFERENCE_CHUNK_SIZE: int = 64 * 1024
+
+ISO_DATETIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?")
+
+WHITESPACE: str = " \t\n\r"
+DELIMITERS: str = WHITESPACE + ",]"
+
+class TypeInferenceData(TypedDict):
+	types: dict[str, DaxType]
+	null_fields: list[str]
+	record_count: int
+
+# yields each item of a top level json array while only holding a chunk or so of text at a time
+def iter_json_array(fp: TextIO, chunk_size: int = INFERENCE_CHUNK_SIZE) -> Iterator[Any]:
+	decoder = json.JSONDecoder()
+	buffer = ""
+	index = 0
+	is_eof = False
+	is_started = False
+
+	def skip(index: int, characters: str) -> int:
+		while index < len(buffer) and buffer[index] in characters:
+			index += 1
+		return index
+
+	while True:
+		index = skip(index, WHITESPACE + ("," if is_started else ""))
+		if index >= len(buffer) and not is_eof:
+			chunk = fp.read(chunk_size)
+			buffer = buffer[index:] + chunk
+			index = 0
+			is_eof = chunk == ""
+			continue
+
+		if index >= len(buffer):
+			assert not is_started, "json array is not closed"
+			return
+
+		if not is_started:
+			assert buffer[index] == "[", "json data must be an array of records"
+			is_started = True
+			index += 1
+			continue
+
+		if buffer[index] == "]":
+			return
+
+		try:
+			value, end = decoder.raw_decode(buffer, index)
+		except json.JSONDecodeError:
+			assert not is_eof, f"invalid json at character {index}"
+			value, end = None, -1
+
+		# a value not yet followed by a delimiter may have been cut short, so it's read again with more text
+		if end == -1 or (not is_eof and (end >= len(buffer) or not buffer[end] in DELIMITERS)):
+			chunk = fp.read(chunk_size)
+			buffer = buffer[index:] + chunk
+			index = 0
+			is_eof = chunk == ""
+			continue
+
+		yield value
+		index = end
+
+def get_value_dax_type(value: Any) -> DaxType | None:
+	if value is None:
+		return None
+	elif value is True or value is False:
+		return "boolean"
+	elif isinstance(value, int):
+		return "int64"
+	elif isinstance(value, float):
+		if value.is_integer():
+			return "int64"
+		return "double"
+	elif isinstance(value, str) and ISO_DATETIME_PATTERN.fullmatch(value):
+		return "dateTime"
+	return "string"
+
+def get_wider_dax_type(a: DaxType, b: DaxType) -> DaxType:
+	if a == b:
+		return a
+	elif a in ["int64", "double"] and b in ["int64", "double"]:
+		return "double"
+	return "string"
+
+def infer_dax_types_from_records(records: Iterator[Any], sample_size: int | None = None) -> TypeInferenceData:
+	types: dict[str, DaxType | None] = {}
+	record_count = 0
+	for record in records:
+		if sample_size != None and record_count >= sample_size:
+			break
+		record_count += 1
+		assert isinstance(record, dict), f"record {record_count} is not an object"
+		for key, value in record.items():
+			value_type = get_value_dax_type(value)
+			current_type = types.get(key)
+			if current_type == None:
+				types[key] = value_type
+			elif value_type != None and value_type != current_type:
+				types[key] = get_wider_dax_type(current_type, value_type)
+
+	out: TypeInferenceData = {
+		"types": {},
+		"null_fields": [],
+		"record_count": record_count,
+	}
+	for key, dax_type in types.items():
+		if dax_type == None:
+			out["null_fields"].append(key)
+		else:
+			out["types"][key] = dax_type
+	return out
+
+def infer_dax_types(
+	json_path: str,
+	sample_size: int | None = None,
+	encoding: str = "utf-8-sig",
+	chunk_size: int = INFERENCE_CHUNK_SIZE
+) -> TypeInferenceData:
+	with open(json_path, "r", encoding=encoding) as file:
+		return infer_dax_types_from_records(iter_json_array(file, chunk_size), sample_size)
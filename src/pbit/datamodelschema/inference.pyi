@@ -0,0 +1,18 @@
+from .dax import DaxType as DaxType
+from typing import Any, Iterator, TextIO, TypedDict
+
+INFERENCE_CHUNK_SIZE: int
+ISO_DATETIME_PATTERN: Any
+WHITESPACE: str
+DELIMITERS: str
+
+class TypeInferenceData(TypedDict):
+    types: dict[str, DaxType]
+    null_fields: list[str]
+    record_count: int
+
+def iter_json_array(fp: TextIO, chunk_size: int = ...) -> Iterator[Any]: ...
+def get_value_dax_type(value: Any) -> DaxType | None: ...
+def get_wider_dax_type(a: DaxType, b: DaxType) -> DaxType: ...
+def infer_dax_types_from_records(records: Iterator[Any], sample_size: int | None = ...) -> TypeInferenceData: ...
+def infer_dax_types(json_path: str, sample_size: int | None = ..., encoding: str = ..., chunk_size: int = ...) -> TypeInferenceData: ...
@@ -3,6 +3,9 @@ from uuid import uuid4
 from copy import deepcopy
 from pandas import DataFrame
 from .column import DaxType
+from .dax import DaxReference, get_dax_references, get_dax_expression_text
+from .tracking import Tracked
+from .typeholder import intern_fields
 
 class MeasureProperty(TypedDict):
 	property: str
@@ -14,31 +17,59 @@ class MeasureData(TypedDict):
 	lineageTag: str
 	dataType: DaxType
 
-class Measure():
-	name: str
-	id: str
-	expression: str
-	data_type: DaxType
-	format_string: str
-	reference_data: MeasureData
+INTERNED_MEASURE_FIELDS: tuple[str, ...] = ("formatString", "dataType")
+
+class Measure(Tracked):
+	__slots__ = ("id", "expression", "data_type", "format_string", "_reference_data", "_name")
+	id: str | None
+	expression: str | list[str] | None
+	data_type: DaxType | None
+	format_string: str | None
+	_reference_data: MeasureData | None
+	_name: str
+	_owner: Any
 
 	def __init__(
 		self,
 		name: str,
 		data_type: DaxType
 	):
-		self.name = name
+		self._owner = None
+		self._name = name
 		self.id = str(uuid4())
 		self.expression = ""
 		self.data_type = data_type
 		self.format_string = ""
-		self.reference_data: MeasureData = {
-			"name": self.name,
-			"expression": self.expression,
-			"formatString": self.format_string,
-			"lineageTag": self.id,
-			"dataType": self.data_type,
-		}
+		self._reference_data = None
+
+	# every field of a new measure is held on the measure itself, so its reference data is only built when asked for
+	@property
+	def reference_data(self) -> MeasureData:
+		if self._reference_data == None:
+			self._reference_data = {
+				"name": self.name,
+				"expression": self.expression,
+				"formatString": self.format_string,
+				"lineageTag": self.id,
+				"dataType": self.data_type,
+			}
+		assert self._reference_data != None
+		return self._reference_data
+
+	@reference_data.setter
+	def reference_data(self, reference_data: MeasureData):
+		self._reference_data = reference_data
+
+	@property
+	def name(self) -> str:
+		return self._name
+
+	@name.setter
+	def name(self, name: str):
+		old_name = self._name
+		self._name = name
+		if self._owner != None and old_name != name:
+			self._owner._rename_measure(self, old_name, name)
 
 	def set_format(self, format: str):
 		self.format_string = format
@@ -52,20 +83,42 @@ class Measure():
 		self.set_expression(expression, "double")
 		self.set_format("0.00%;-0.00%;0.00%")
 
-	def load(self, data: MeasureData):
-		self.reference_data = deepcopy(data)
-		self.name = self.reference_data["name"]
-		self.expression = self.reference_data["expression"]
-		self.format_string = self.reference_data["formatString"]
-		self.id = self.reference_data["lineageTag"]
-		self.data_type = self.reference_data["dataType"]
-
-	def dump(self) -> MeasureData:
-		measure_data = deepcopy(self.reference_data)
-		measure_data["name"] = self.name
-		measure_data["expression"] = self.expression
-		measure_data["formatString"] = self.format_string
-		measure_data["lineageTag"] = self.id
-		measure_data["dataType"] = self.data_type
+	def get_dax_references(self) -> tuple[DaxReference, ...]:
+		if self.expression == None:
+			return ()
+		return get_dax_references(get_dax_expression_text(self.expression))
+
+	def load(self, data: MeasureData, copy: bool = True):
+		if copy:
+			self.reference_data = deepcopy(data)
+		else:
+			self.reference_data = data
+		reference_data: Any = self.reference_data
+		intern_fields(reference_data, INTERNED_MEASURE_FIELDS)
+		self.name = reference_data["name"]
+		self.expression = reference_data.get("expression")
+		self.format_string = reference_data.get("formatString")
+		self.id = reference_data.get("lineageTag")
+		self.data_type = reference_data.get("dataType")
+
+	def dump(self, use_cache: bool = False) -> MeasureData:
+		if use_cache and self._dump_cache != None:
+			return self._dump_cache
+		measure_data: Any = {}
+		if self._reference_data != None:
+			assert self._reference_data != None
+			measure_data = self._reference_data.copy()
+		# fields a loaded measure didn't have are only added once they're given a value
+		for key, value in [
+			("name", self.name),
+			("expression", self.expression),
+			("formatString", self.format_string),
+			("lineageTag", self.id),
+			("dataType", self.data_type),
+		]:
+			if value is not None or key in measure_data:
+				measure_data[key] = value
 
+		if use_cache:
+			self._dump_cache = measure_data
 		return measure_data
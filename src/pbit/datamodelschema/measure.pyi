@@ -1,4 +1,7 @@
 from .column import DaxType as DaxType
+from .dax import DaxReference as DaxReference, get_dax_expression_text as get_dax_expression_text, get_dax_references as get_dax_references
+from .tracking import Tracked as Tracked
+from .typeholder import intern_fields as intern_fields
 from pandas import DataFrame as DataFrame
 from typing import TypedDict
 
@@ -12,16 +15,25 @@ class MeasureData(TypedDict):
     lineageTag: str
     dataType: DaxType
 
-class Measure:
-    name: str
-    id: str
-    expression: str
-    data_type: DaxType
-    format_string: str
-    reference_data: MeasureData
+INTERNED_MEASURE_FIELDS: tuple[str, ...]
+
+class Measure(Tracked):
+    id: str | None
+    expression: str | list[str] | None
+    data_type: DaxType | None
+    format_string: str | None
     def __init__(self, name: str, data_type: DaxType) -> None: ...
+    @property
+    def reference_data(self) -> MeasureData: ...
+    @reference_data.setter
+    def reference_data(self, reference_data: MeasureData): ...
+    @property
+    def name(self) -> str: ...
+    @name.setter
+    def name(self, name: str): ...
     def set_format(self, format: str): ...
     def set_expression(self, expression: str, data_type: DaxType): ...
     def set_to_retention_rate_tracker(self, user_table_name: str, is_retained_column_name: str): ...
-    def load(self, data: MeasureData): ...
-    def dump(self) -> MeasureData: ...
+    def get_dax_references(self) -> tuple[DaxReference, ...]: ...
+    def load(self, data: MeasureData, copy: bool = ...): ...
+    def dump(self, use_cache: bool = ...) -> MeasureData: ...
@@ -2,7 +2,9 @@ from typing import TypedDict, Literal, Any
 from uuid import uuid4
 from copy import deepcopy
 from .column import DaxType
-from .powerquery import PowerQuery, MType, from_dax_type_to_m_type
+from .powerquery import PowerQuery, MType, from_dax_type_to_m_type, parse_m
+from .tracking import Tracked
+from .typeholder import intern_fields
 
 class PartitionSourceData(TypedDict):
 	type: str
@@ -15,7 +17,10 @@ class PartitionData(TypedDict):
 	queryGroup: str | None
 	source: PartitionSourceData
 
-class Partition():
+INTERNED_PARTITION_FIELDS: tuple[str, ...] = ("mode", "state", "queryGroup")
+
+class Partition(Tracked):
+	__slots__ = ("name", "language", "power_query", "query_group", "reference_data")
 	name: str | None
 	language: str
 	power_query: PowerQuery
@@ -28,9 +33,11 @@ class Partition():
 		language: str = "m",
 		query_group: str | None = None
 	):
+		self._owner = None
 		self.name = name
 		self.language = language
 		self.power_query = PowerQuery()
+		self.power_query._owner = self
 		self.query_group = query_group
 		self.reference_data: PartitionData = {
 			"name": self.name,
@@ -58,8 +65,20 @@ class Partition():
 		m_dax_types = from_dax_type_to_m_type(dax_types)
 		self.power_query.insert_transform_dax_types_cmd(m_dax_types)
 
-	def load(self, data: PartitionData):
-		self.reference_data = deepcopy(data)
+	def parse_power_query(self) -> PowerQuery:
+		assert self.language == "m", f"partition {self.name} is not a power query partition"
+		power_query = parse_m(self.reference_data["source"]["expression"])
+		power_query._owner = self
+		self.power_query = power_query
+		return power_query
+
+	def load(self, data: PartitionData, copy: bool = True):
+		if copy:
+			self.reference_data = deepcopy(data)
+		else:
+			self.reference_data = data
+		intern_fields(self.reference_data, INTERNED_PARTITION_FIELDS)
+		intern_fields(self.reference_data["source"], ("type",))
 		if "name" in self.reference_data:
 			self.name = self.reference_data["name"]
 		if "queryGroup" in self.reference_data:
@@ -68,12 +87,17 @@ class Partition():
 			self.query_group = None
 		self.language =self.reference_data["source"]["type"]
 		
-	def dump(self) -> PartitionData:
-		partition_data = deepcopy(self.reference_data)
+	def dump(self, use_cache: bool = False) -> PartitionData:
+		if use_cache and self._dump_cache != None:
+			return self._dump_cache
+		partition_data = self.reference_data.copy()
+		partition_data["source"] = self.reference_data["source"].copy()
 		partition_data["name"] = self.name
 		partition_data["queryGroup"] = self.query_group
 		partition_data["source"]["type"] = self.language
 		if len(self.power_query.commands) > 0:
 			partition_data["source"]["expression"] = self.power_query.dump()
 
+		if use_cache:
+			self._dump_cache = partition_data
 		return partition_data
\ No newline at end of file
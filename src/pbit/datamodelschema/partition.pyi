@@ -1,5 +1,7 @@
 from .column import DaxType as DaxType
-from .powerquery import MType as MType, PowerQuery as PowerQuery, from_dax_type_to_m_type as from_dax_type_to_m_type
+from .powerquery import MType as MType, PowerQuery as PowerQuery, from_dax_type_to_m_type as from_dax_type_to_m_type, parse_m as parse_m
+from .tracking import Tracked as Tracked
+from .typeholder import intern_fields as intern_fields
 from typing import TypedDict
 from uuid import uuid4 as uuid4
 
@@ -14,7 +16,9 @@ class PartitionData(TypedDict):
     queryGroup: str | None
     source: PartitionSourceData
 
-class Partition:
+INTERNED_PARTITION_FIELDS: tuple[str, ...]
+
+class Partition(Tracked):
     name: str | None
     language: str
     power_query: PowerQuery
@@ -22,5 +26,6 @@ class Partition:
     reference_data: PartitionData
     def __init__(self, name: str | None = ..., language: str = ..., query_group: str | None = ...) -> None: ...
     def set_to_json_reader(self, relative_json_path: str, dax_types: dict[str, DaxType]): ...
-    def load(self, data: PartitionData): ...
-    def dump(self) -> PartitionData: ...
+    def parse_power_query(self) -> PowerQuery: ...
+    def load(self, data: PartitionData, copy: bool = ...): ...
+    def dump(self, use_cache: bool = ...) -> PartitionData: ...
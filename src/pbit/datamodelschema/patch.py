@@ -0,0 +1,211 @@
+from typing import TypedDict, Literal, Any
+from copy import deepcopy
+
+PATCH_VERSION: int = 1
+
+DEFAULT_KEY_FIELDS: list[str] = ["name", "lineageTag"]
+
+PatchOperationType = Literal["add", "remove", "replace", "move"]
+
+# a str segment is a dict key, a single entry dict such as {"name": "Sales"} selects a list item
+PatchPathSegment = str | dict[str, str]
+
+class PatchOperationData(TypedDict):
+	op: PatchOperationType
+	path: list[PatchPathSegment]
+	value: Any
+	index: int | None
+
+class SchemaPatchData(TypedDict):
+	version: int
+	operations: list[PatchOperationData]
+
+def get_list_key_field(old_list: list, new_list: list, key_fields: list[str]) -> str | None:
+	if len(old_list) == 0 and len(new_list) == 0:
+		return None
+	for key_field in key_fields:
+		is_keyed = True
+		for item_list in [old_list, new_list]:
+			keys: set[str] = set()
+			for item in item_list:
+				if not isinstance(item, dict) or not isinstance(item.get(key_field), str) or item[key_field] in keys:
+					is_keyed = False
+					break
+				keys.add(item[key_field])
+			if not is_keyed:
+				break
+		if is_keyed:
+			return key_field
+	return None
+
+def get_if_equal(old_value: Any, new_value: Any) -> bool:
+	return type(old_value) == type(new_value) and old_value == new_value
+
+def diff_values(
+	old_value: Any,
+	new_value: Any,
+	path: list[PatchPathSegment],
+	operations: list[PatchOperationData],
+	key_fields: list[str]
+):
+	if isinstance(old_value, dict) and isinstance(new_value, dict):
+		for key in old_value:
+			if not key in new_value:
+				operations.append({"op": "remove", "path": path + [key], "value": None, "index": None})
+		for key, value in new_value.items():
+			if not key in old_value:
+				operations.append({"op": "add", "path": path + [key], "value": deepcopy(value), "index": None})
+			else:
+				diff_values(old_value[key], value, path + [key], operations, key_fields)
+
+	elif isinstance(old_value, list) and isinstance(new_value, list):
+		key_field = get_list_key_field(old_value, new_value, key_fields)
+		if key_field == None:
+			if not get_if_equal(old_value, new_value):
+				operations.append({"op": "replace", "path": path, "value": deepcopy(new_value), "index": None})
+			return
+
+		assert key_field
+		old_items: dict[str, Any] = {}
+		for item in old_value:
+			old_items[item[key_field]] = item
+		new_keys: set[str] = set()
+		for item in new_value:
+			new_keys.add(item[key_field])
+
+		for key in old_items:
+			if not key in new_keys:
+				operations.append({"op": "remove", "path": path + [{key_field: key}], "value": None, "index": None})
+
+		# the keys as the list will be when each operation is applied, items are only moved when they're out of place
+		keys = [key for key in old_items if key in new_keys]
+		for i, item in enumerate(new_value):
+			key = item[key_field]
+			if key in old_items:
+				if keys[i] != key:
+					keys.remove(key)
+					keys.insert(i, key)
+					operations.append({"op": "move", "path": path + [{key_field: key}], "value": None, "index": i})
+				diff_values(old_items[key], item, path + [{key_field: key}], operations, key_fields)
+			else:
+				keys.insert(i, key)
+				operations.append({"op": "add", "path": path + [{key_field: key}], "value": deepcopy(item), "index": i})
+
+	elif not get_if_equal(old_value, new_value):
+		operations.append({"op": "replace", "path": path, "value": deepcopy(new_value), "index": None})
+
+def diff_schema(old_data: Any, new_data: Any, key_fields: list[str] = DEFAULT_KEY_FIELDS) -> SchemaPatchData:
+	operations: list[PatchOperationData] = []
+	diff_values(old_data, new_data, [], operations, key_fields)
+	return {
+		"version": PATCH_VERSION,
+		"operations": operations,
+	}
+
+class PatchTarget():
+	data: Any
+	list_indexes: dict[tuple[int, str], dict[str, int]]
+
+	def __init__(self, data: Any):
+		self.data = data
+		self.list_indexes = {}
+
+	def get_list_index(self, item_list: list, key_field: str) -> dict[str, int]:
+		index_key = (id(item_list), key_field)
+		if not index_key in self.list_indexes:
+			index: dict[str, int] = {}
+			for i, item in enumerate(item_list):
+				if isinstance(item, dict) and key_field in item:
+					index.setdefault(item[key_field], i)
+			self.list_indexes[index_key] = index
+		return self.list_indexes[index_key]
+
+	def forget_list_index(self, item_list: list):
+		for index_key in list(self.list_indexes.keys()):
+			if index_key[0] == id(item_list):
+				del self.list_indexes[index_key]
+
+	def resolve(self, path: list[PatchPathSegment]) -> Any:
+		value = self.data
+		for segment in path:
+			if isinstance(segment, str):
+				if not isinstance(value, dict) or not segment in value:
+					return None
+				value = value[segment]
+			else:
+				if not isinstance(value, list):
+					return None
+				key_field, key = next(iter(segment.items()))
+				index = self.get_list_index(value, key_field)
+				if not key in index:
+					return None
+				value = value[index[key]]
+		return value
+
+	def apply(self, operation: PatchOperationData) -> bool:
+		path = operation["path"]
+		if len(path) == 0:
+			if operation["op"] != "replace":
+				return False
+			self.data = deepcopy(operation["value"])
+			self.list_indexes = {}
+			return True
+
+		parent = self.resolve(path[:-1])
+		segment = path[-1]
+		op = operation["op"]
+
+		if isinstance(segment, str):
+			if not isinstance(parent, dict):
+				return False
+			if op == "remove":
+				if not segment in parent:
+					return False
+				self.forget_list_index(parent[segment])
+				del parent[segment]
+			else:
+				if segment in parent and isinstance(parent[segment], list):
+					self.forget_list_index(parent[segment])
+				parent[segment] = deepcopy(operation["value"])
+			return True
+
+		if not isinstance(parent, list):
+			return False
+		key_field, key = next(iter(segment.items()))
+		index = self.get_list_index(parent, key_field)
+		if op == "remove":
+			if not key in index:
+				return False
+			del parent[index[key]]
+			self.forget_list_index(parent)
+		elif op == "move":
+			if not key in index or operation.get("index") == None:
+				return False
+			move_index = operation["index"]
+			assert move_index != None
+			item = parent.pop(index[key])
+			parent.insert(min(move_index, len(parent)), item)
+			self.forget_list_index(parent)
+		elif key in index:
+			parent[index[key]] = deepcopy(operation["value"])
+		elif op == "add":
+			insert_index = operation["index"] if operation.get("index") != None else len(parent)
+			assert insert_index != None
+			parent.insert(min(insert_index, len(parent)), deepcopy(operation["value"]))
+			self.forget_list_index(parent)
+		else:
+			return False
+		return True
+
+def apply_patch(schema_data: Any, patch: SchemaPatchData, copy: bool = True, strict: bool = True) -> Any:
+	assert patch["version"] == PATCH_VERSION, f"unsupported patch version {patch['version']}"
+	target_data = schema_data
+	if copy:
+		target_data = deepcopy(schema_data)
+
+	target = PatchTarget(target_data)
+	for operation in patch["operations"]:
+		is_applied = target.apply(operation)
+		assert is_applied or not strict, f"could not {operation['op']} {operation['path']}"
+
+	return target.data
@@ -0,0 +1,32 @@
+from typing import Any, Literal, TypedDict
+
+PATCH_VERSION: int
+DEFAULT_KEY_FIELDS: list[str]
+PatchOperationType = Literal["add", "remove", "replace", "move"]
+PatchPathSegment = str | dict[str, str]
+
+class PatchOperationData(TypedDict):
+    op: PatchOperationType
+    path: list[PatchPathSegment]
+    value: Any
+    index: int | None
+
+class SchemaPatchData(TypedDict):
+    version: int
+    operations: list[PatchOperationData]
+
+def get_list_key_field(old_list: list, new_list: list, key_fields: list[str]) -> str | None: ...
+def get_if_equal(old_value: Any, new_value: Any) -> bool: ...
+def diff_values(old_value: Any, new_value: Any, path: list[PatchPathSegment], operations: list[PatchOperationData], key_fields: list[str]): ...
+def diff_schema(old_data: Any, new_data: Any, key_fields: list[str] = ...) -> SchemaPatchData: ...
+
+class PatchTarget:
+    data: Any
+    list_indexes: dict[tuple[int, str], dict[str, int]]
+    def __init__(self, data: Any) -> None: ...
+    def get_list_index(self, item_list: list, key_field: str) -> dict[str, int]: ...
+    def forget_list_index(self, item_list: list): ...
+    def resolve(self, path: list[PatchPathSegment]) -> Any: ...
+    def apply(self, operation: PatchOperationData) -> bool: ...
+
+def apply_patch(schema_data: Any, patch: SchemaPatchData, copy: bool = ..., strict: bool = ...) -> Any: ...
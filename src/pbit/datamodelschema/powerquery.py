@@ -1,6 +1,7 @@
 from typing import TypedDict, Literal, Any, Callable
 from uuid import uuid4
 from .column import DaxType
+from .tracking import Tracked
 import os
 
 PRIOR_PREFIX: str = "~!PRIOR_TABLE_KEY!~"
@@ -48,6 +49,19 @@ def from_dax_type_to_m_type(dax_type_dict: dict[str, DaxType]) -> dict[str, MTyp
 					out[key] = m_type
 	return out
 
+M_KNOWN_PARAMETER_ORDERS: dict[str, list[str]] = {
+	"File.Contents": ["path", "options"],
+	"Json.Document": ["source", "encoding"],
+	"Csv.Document": ["source", "columns", "delimiter", "extra_values", "encoding"],
+	"Table.FromList": ["source", "splitter", "columns", "default", "extra_values"],
+	"Table.ExpandRecordColumn": ["source", "column", "field_names", "new_column_names"],
+	"Table.TransformColumnTypes": ["source", "type_transformations", "culture"],
+}
+
+MTokenKind = Literal["string", "quoted", "comment", "open", "close", "comma", "equals", "word", "other"]
+
+MToken = tuple[MTokenKind, int, int]
+
 def list_to_m_str(list: list, wrap_values_as_str: bool) -> str:
 	out = "{"
 	for i, val in enumerate(list):
@@ -81,19 +95,23 @@ def dict_to_m_str(dict: dict, wrap_keys_as_str: bool, wrap_values_as_str: bool)
 	out += "}"
 	return out
 
-class Command():
+class Command(Tracked):
 	id: str
 	name: str
 	function_text: str
 	parameter_order: list[str]
 	parameters: dict[str, str | int | None]
+	step_name: str | None
+	is_call: bool
 	get_command_name: Callable[[str], str]
 	def __init__(
 		self,
 		function_text: str,
 		parameter_order: list[str],
 		parameters: dict[str, str | int | None],
-		name: str | None = None
+		name: str | None = None,
+		step_name: str | None = None,
+		is_call: bool = True
 	):
 		self.id = str(uuid4())
 		self.function_text = function_text
@@ -104,24 +122,29 @@ class Command():
 			self.name = name
 		self.parameter_order = parameter_order
 		self.parameters = parameters
+		self.step_name = step_name
+		self.is_call = is_call
 
-	def dump(self, command_name: str | None = None, include_comma: bool = True) -> str:
-		command_str = self.function_text + "("
-		for i, key in enumerate(self.parameter_order):
-			command_str += " "
-			if key in self.parameters and self.parameters[key] != None:
-				val: str | int | None = self.parameters[key]
-				assert val
+	def set_parameter(self, key: str, value: str | int | None):
+		if not key in self.parameter_order:
+			self.parameter_order.append(key)
+		self.parameters[key] = value
+		self.mark_dirty()
 
-				command_str += str(val)
-
-			else:
-				command_str += "null"
-
-			if i < len(self.parameter_order)-1:
-				command_str += ","
-
-		command_str += ")"
+	def dump(self, command_name: str | None = None, include_comma: bool = True) -> str:
+		if self.is_call:
+			values: list[str] = []
+			for key in self.parameter_order:
+				if key in self.parameters and self.parameters[key] != None:
+					val: str | int | None = self.parameters[key]
+					assert val
+
+					values.append(" " + str(val))
+				else:
+					values.append(" null")
+			command_str = self.function_text + "(" + ",".join(values) + ")"
+		else:
+			command_str = self.function_text
 
 		if include_comma:
 			command_str += ","
@@ -131,33 +154,53 @@ class Command():
 		else:
 			return command_str
 
-class PowerQuery():
+class PowerQuery(Tracked):
 	commands: list[Command]
+	result: str | None
 	def __init__(self):
 		self.commands = []
+		self.result = None
 
 	def dump(self) -> list[str]:
 		bases: dict[str, int] = {}
-		query = "let"
+		used_names: set[str] = set()
+		for command in self.commands:
+			if command.step_name != None:
+				assert command.step_name
+				used_names.add(command.step_name)
+
+		lines = ["let"]
 		final_command_name = ""
 
 		for i, command in enumerate(self.commands):
-			command_name = command.name
-			if not command_name in bases:
-				bases[command_name] = 1
-				command_name += "1"
+			if command.step_name != None:
+				assert command.step_name
+				command_name = command.step_name
 			else:
-				bases[command_name] += 1
-				command_name += str(bases[command_name]+1)
+				command_name = command.name
+				if not command_name in bases:
+					bases[command_name] = 1
+					command_name += "1"
+				else:
+					bases[command_name] += 1
+					command_name += str(bases[command_name]+1)
+				while command_name in used_names:
+					bases[command.name] += 1
+					command_name = command.name + str(bases[command.name]+1)
 			command_str = command.dump(command_name, i < len(self.commands)-1)
-			command_str = command_str.replace(PRIOR_PREFIX, final_command_name)
+			if PRIOR_PREFIX in command_str:
+				command_str = command_str.replace(PRIOR_PREFIX, final_command_name)
 			final_command_name = command_name
-			query += "\n\t"+command_str
-			
-		query += "\nin"
-		query += f"\n\t#\"{final_command_name}\""
+			lines.extend(("\t" + command_str).split("\n"))
+
+		lines.append("in")
+		if self.result != None:
+			assert self.result
+			lines.extend(("\t" + self.result).split("\n"))
+		else:
+			lines.append(f"\t#\"{final_command_name}\"")
 
-		return query.split("\n")
+		return lines
 
 	def insert_cmd(
 		self,
@@ -166,7 +209,9 @@ class PowerQuery():
 		parameters: dict[str, str | int | None],
 		name: str | None = None) -> Command:
 		command = Command(function_text, parameter_order, parameters, name)
+		command._owner = self
 		self.commands.append(command)
+		self.mark_dirty()
 		return command
 
 
@@ -327,4 +372,193 @@ class PowerQuery():
 			},
 			name = name
 		)
-		return command	
\ No newline at end of file
+		return command	
+
+def get_m_step_reference(step_name: str) -> str:
+	return "#\"" + step_name.replace("\"", "\"\"") + "\""
+
+def get_m_string_end(text: str, quote_index: int) -> int:
+	i = quote_index + 1
+	while True:
+		end = text.find("\"", i)
+		if end == -1:
+			return len(text)
+		if text.startswith("\"\"", end):
+			i = end + 2
+			continue
+		return end + 1
+
+def tokenize_m(text: str) -> list[MToken]:
+	tokens: list[MToken] = []
+	i = 0
+	length = len(text)
+	while i < length:
+		char = text[i]
+		if char.isspace():
+			i += 1
+			continue
+
+		kind: MTokenKind = "other"
+		end = i + 1
+		if char == "\"":
+			kind, end = "string", get_m_string_end(text, i)
+		elif char == "#" and text.startswith("#\"", i):
+			kind, end = "quoted", get_m_string_end(text, i + 1)
+		elif text.startswith("//", i):
+			end = text.find("\n", i)
+			kind, end = "comment", (length if end == -1 else end)
+		elif text.startswith("/*", i):
+			end = text.find("*/", i + 2)
+			kind, end = "comment", (length if end == -1 else end + 2)
+		elif char in "([{":
+			kind = "open"
+		elif char in ")]}":
+			kind = "close"
+		elif char == ",":
+			kind = "comma"
+		elif char == "=":
+			if text.startswith("=>", i):
+				end = i + 2
+			else:
+				kind = "equals"
+		elif char in "<>" and text.startswith("=", i + 1):
+			end = i + 2
+		elif char.isalnum() or char in "_#.":
+			while end < length and (text[end].isalnum() or text[end] in "_#."):
+				end += 1
+			kind = "word"
+		tokens.append((kind, i, end))
+		i = end
+	return tokens
+
+def get_m_name(text: str, token: MToken) -> str:
+	kind, start, end = token
+	if kind == "quoted":
+		return text[start+2:end-1].replace("\"\"", "\"")
+	return text[start:end]
+
+def parse_m_command(text: str, step_name: str, tokens: list[MToken], prior_step_name: str | None) -> Command:
+	start = tokens[0][1]
+	end = tokens[-1][2]
+	expression = text[start:end].strip()
+	significant = [token for token in tokens if token[0] != "comment"]
+
+	is_call = (
+		len(significant) >= 3
+		and significant[0][0] == "word"
+		and significant[0] is tokens[0]
+		and text[significant[1][1]] == "("
+		and text[significant[-1][1]] == ")"
+		and significant[-1] is tokens[-1]
+	)
+
+	arguments: list[str] = []
+	if is_call:
+		depth = 0
+		arg_start = significant[1][2]
+		for token in significant[1:]:
+			kind, token_start, token_end = token
+			if kind == "open":
+				depth += 1
+			elif kind == "close":
+				depth -= 1
+				if depth == 0 and not token is significant[-1]:
+					is_call = False
+					break
+			elif kind == "comma" and depth == 1:
+				arguments.append(text[arg_start:token_start].strip())
+				arg_start = token_end
+		if is_call:
+			last_argument = text[arg_start:significant[-1][1]].strip()
+			if last_argument != "" or len(arguments) > 0:
+				arguments.append(last_argument)
+
+	if not is_call:
+		return Command(expression, [], {}, step_name, step_name, is_call=False)
+
+	function_text = text[significant[0][1]:significant[0][2]]
+	parameter_order = list(M_KNOWN_PARAMETER_ORDERS.get(function_text, []))
+	while len(parameter_order) < len(arguments):
+		parameter_order.append(f"arg{len(parameter_order)}")
+
+	prior_references: list[str] = []
+	if prior_step_name != None:
+		assert prior_step_name
+		prior_references.append(get_m_step_reference(prior_step_name))
+		prior_references.append(prior_step_name)
+
+	parameters: dict[str, str | int | None] = {}
+	for key, argument in zip(parameter_order, arguments):
+		if argument == "null":
+			parameters[key] = None
+		elif argument in prior_references:
+			parameters[key] = "#\"" + PRIOR_PREFIX + "\""
+		else:
+			parameters[key] = argument
+
+	return Command(function_text, parameter_order[:len(arguments)], parameters, step_name, step_name)
+
+def parse_m(expression: str | list[str]) -> PowerQuery:
+	text = expression if isinstance(expression, str) else "\n".join(expression)
+	tokens = tokenize_m(text)
+	significant = [token for token in tokens if token[0] != "comment"]
+	assert len(significant) > 0 and text[significant[0][1]:significant[0][2]] == "let", "expression is not a let ... in expression"
+
+	steps: list[tuple[str, list[MToken]]] = []
+	step_tokens: list[MToken] = []
+	step_name: str | None = None
+	depth = 0
+	let_depth = 0
+	result_start: int | None = None
+
+	def end_step():
+		assert step_name != None and len(step_tokens) > 0, "let step without a name or expression"
+		assert step_name
+		steps.append((step_name, list(step_tokens)))
+
+	for token in tokens[tokens.index(significant[0]) + 1:]:
+		kind, start, end = token
+		if kind == "open":
+			depth += 1
+		elif kind == "close":
+			depth -= 1
+		elif depth == 0 and kind == "word" and text[start:end] == "let":
+			let_depth += 1
+		elif depth == 0 and kind == "word" and text[start:end] == "in":
+			if let_depth > 0:
+				let_depth -= 1
+			else:
+				end_step()
+				result_start = end
+				break
+		elif depth == 0 and let_depth == 0 and kind == "comma":
+			end_step()
+			step_tokens = []
+			step_name = None
+			continue
+
+		if step_name == None:
+			if kind == "equals":
+				names = [name_token for name_token in step_tokens if name_token[0] != "comment"]
+				assert len(names) == 1, "let step has no name"
+				step_name = get_m_name(text, names[0])
+				step_tokens = []
+				continue
+		step_tokens.append(token)
+
+	assert result_start != None, "let expression has no in"
+	assert result_start
+
+	power_query = PowerQuery()
+	prior_step_name: str | None = None
+	for name, command_tokens in steps:
+		command = parse_m_command(text, name, command_tokens, prior_step_name)
+		command._owner = power_query
+		power_query.commands.append(command)
+		prior_step_name = name
+
+	result = text[result_start:].strip()
+	if prior_step_name == None or not result in [get_m_step_reference(prior_step_name), prior_step_name]:
+		power_query.result = result
+
+	return power_query
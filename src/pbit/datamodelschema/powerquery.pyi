@@ -1,28 +1,36 @@
 from .column import DaxType as DaxType
+from .tracking import Tracked as Tracked
 from _typeshed import Incomplete
-from typing import Callable
+from typing import Callable, Literal
 
 PRIOR_PREFIX: str
 MType: Incomplete
 M_TYPE_TO_COLUMN_TYPE: dict[MType, DaxType]
+M_KNOWN_PARAMETER_ORDERS: dict[str, list[str]]
+MTokenKind = Literal["string", "quoted", "comment", "open", "close", "comma", "equals", "word", "other"]
+MToken = tuple[MTokenKind, int, int]
 
 def from_m_type_to_dax_type(m_type_dict: dict[str, MType]) -> dict[str, DaxType]: ...
 def from_dax_type_to_m_type(dax_type_dict: dict[str, DaxType]) -> dict[str, MType]: ...
 def list_to_m_str(list: list, wrap_values_as_str: bool) -> str: ...
 def dict_to_m_str(dict: dict, wrap_keys_as_str: bool, wrap_values_as_str: bool) -> str: ...
 
-class Command:
+class Command(Tracked):
     id: str
     name: str
     function_text: str
     parameter_order: list[str]
     parameters: dict[str, str | int | None]
+    step_name: str | None
+    is_call: bool
     get_command_name: Callable[[str], str]
-    def __init__(self, function_text: str, parameter_order: list[str], parameters: dict[str, str | int | None], name: str | None = ...) -> None: ...
+    def __init__(self, function_text: str, parameter_order: list[str], parameters: dict[str, str | int | None], name: str | None = ..., step_name: str | None = ..., is_call: bool = ...) -> None: ...
+    def set_parameter(self, key: str, value: str | int | None): ...
     def dump(self, command_name: str | None = ..., include_comma: bool = ...) -> str: ...
 
-class PowerQuery:
+class PowerQuery(Tracked):
     commands: list[Command]
+    result: str | None
     def __init__(self) -> None: ...
     def dump(self) -> list[str]: ...
     def insert_cmd(self, function_text: str, parameter_order: list[str], parameters: dict[str, str | int | None], name: str | None = ...) -> Command: ...
@@ -32,3 +40,10 @@ class PowerQuery:
     def insert_table_from_list_cmd(self, source=..., splitter: str = ..., columns: str | None = ..., default: str | None = ..., extra_values: str | None = ..., name: str | None = ...) -> Command: ...
     def insert_expand_from_record_cmd(self, target_column: str, conversion_table: dict[str, str] | list[str], source=..., name: str | None = ...) -> Command: ...
     def insert_transform_dax_types_cmd(self, transformations: dict[str, MType], source=..., culture: str | None = ..., name: str | None = ...) -> Command: ...
+
+def get_m_step_reference(step_name: str) -> str: ...
+def get_m_string_end(text: str, quote_index: int) -> int: ...
+def tokenize_m(text: str) -> list[MToken]: ...
+def get_m_name(text: str, token: MToken) -> str: ...
+def parse_m_command(text: str, step_name: str, tokens: list[MToken], prior_step_name: str | None) -> Command: ...
+def parse_m(expression: str | list[str]) -> PowerQuery: ...
@@ -1,6 +1,8 @@
 from typing import TypedDict, Literal, Any
 from uuid import uuid4
 from copy import deepcopy
+from .tracking import Tracked
+from .typeholder import intern_fields
 
 class RelationshipData(TypedDict):
 	name: str
@@ -12,14 +14,38 @@ class RelationshipData(TypedDict):
 	crossFilteringBehavior: str | None
 	state: str
 
-class Relationship():
+# what a new relationship dumps as, everything but joinOnDateBehavior and state is filled in from the relationship
+NEW_RELATIONSHIP_DATA: RelationshipData = {
+	"name": "",
+	"fromTable": "",
+	"fromColumn": "",
+	"toTable": "",
+	"toColumn": "",
+	"crossFilteringBehavior": "bothDirections",
+	"joinOnDateBehavior": "datePartOnly",
+	"state": "ready"
+}
+
+INTERNED_RELATIONSHIP_FIELDS: tuple[str, ...] = (
+	"fromTable",
+	"fromColumn",
+	"toTable",
+	"toColumn",
+	"crossFilteringBehavior",
+	"joinOnDateBehavior",
+	"state"
+)
+
+class Relationship(Tracked):
+	__slots__ = ("name", "is_both_directions", "_reference_data", "_from_table", "_from_column", "_to_table", "_to_column")
 	name: str
-	from_table: str
-	from_column: str
-	to_table: str
-	to_column: str
 	is_both_directions: bool
-	reference_data: RelationshipData
+	_reference_data: RelationshipData | None
+	_from_table: str
+	_from_column: str
+	_to_table: str
+	_to_column: str
+	_owner: Any
 
 	def __init__(
 		self,
@@ -29,36 +55,82 @@ class Relationship():
 		to_column: str,
 		is_both_directions=True
 	):
+		self._owner = None
 		self.name = str(uuid4())
-		self.from_table = from_table
-		self.from_column = from_column
-		self.to_table = to_table
-		self.to_column = to_column
+		self._from_table = from_table
+		self._from_column = from_column
+		self._to_table = to_table
+		self._to_column = to_column
 		self.is_both_directions=is_both_directions
+		self._reference_data = None
 
-		self.reference_data: RelationshipData = {
-			"name": self.name,
-			"fromTable": self.from_table,
-			"fromColumn": self.from_column,
-			"toTable": self.to_table,
-			"toColumn": self.to_column,
-			"crossFilteringBehavior": "bothDirections",
-			"joinOnDateBehavior": "datePartOnly",
-			"state": "ready"
-		}
+	@property
+	def reference_data(self) -> RelationshipData:
+		if self._reference_data == None:
+			self._reference_data = self.dump()
+		assert self._reference_data != None
+		return self._reference_data
 
-		if not self.is_both_directions:
-			self.reference_data["crossFilteringBehavior"] = "oneDirection"
-		else:
-			self.reference_data["crossFilteringBehavior"] = "bothDirections"
+	@reference_data.setter
+	def reference_data(self, reference_data: RelationshipData):
+		self._reference_data = reference_data
+
+	def _set_endpoints(self, from_table: str, from_column: str, to_table: str, to_column: str):
+		owner = self._owner
+		if owner != None:
+			owner._unindex_relationship(self)
+		self._from_table = from_table
+		self._from_column = from_column
+		self._to_table = to_table
+		self._to_column = to_column
+		if owner != None:
+			owner._index_relationship(self)
+
+	@property
+	def from_table(self) -> str:
+		return self._from_table
+
+	@from_table.setter
+	def from_table(self, from_table: str):
+		self._set_endpoints(from_table, self._from_column, self._to_table, self._to_column)
+
+	@property
+	def from_column(self) -> str:
+		return self._from_column
 
-	def load(self, data: RelationshipData):
-		self.reference_data = deepcopy(data)
+	@from_column.setter
+	def from_column(self, from_column: str):
+		self._set_endpoints(self._from_table, from_column, self._to_table, self._to_column)
+
+	@property
+	def to_table(self) -> str:
+		return self._to_table
+
+	@to_table.setter
+	def to_table(self, to_table: str):
+		self._set_endpoints(self._from_table, self._from_column, to_table, self._to_column)
+
+	@property
+	def to_column(self) -> str:
+		return self._to_column
+
+	@to_column.setter
+	def to_column(self, to_column: str):
+		self._set_endpoints(self._from_table, self._from_column, self._to_table, to_column)
+
+	def load(self, data: RelationshipData, copy: bool = True):
+		if copy:
+			self.reference_data = deepcopy(data)
+		else:
+			self.reference_data = data
+		intern_fields(self.reference_data, INTERNED_RELATIONSHIP_FIELDS)
 		self.name = self.reference_data["name"]
-		self.from_table = self.reference_data["fromTable"]
-		self.from_column = self.reference_data["fromColumn"]
-		self.to_table = self.reference_data["toTable"]
-		self.to_column = self.reference_data["toColumn"]
+		self._set_endpoints(
+			self.reference_data["fromTable"],
+			self.reference_data["fromColumn"],
+			self.reference_data["toTable"],
+			self.reference_data["toColumn"]
+		)
 		if "crossFilteringBehavior" in self.reference_data:
 			if self.reference_data["crossFilteringBehavior"] == "bothDirections":
 				self.is_both_directions = True
@@ -67,8 +139,13 @@ class Relationship():
 		else:
 			self.is_both_directions = True
 
-	def dump(self) -> RelationshipData:
-		relationship_data = deepcopy(self.reference_data)
+	def dump(self, use_cache: bool = False) -> RelationshipData:
+		if use_cache and self._dump_cache != None:
+			return self._dump_cache
+		if self._reference_data == None:
+			relationship_data = NEW_RELATIONSHIP_DATA.copy()
+		else:
+			relationship_data = self._reference_data.copy()
 		relationship_data["name"] = self.name
 		relationship_data["fromTable"] = self.from_table
 		relationship_data["fromColumn"] = self.from_column
@@ -80,4 +157,6 @@ class Relationship():
 		else:
 			relationship_data["crossFilteringBehavior"] = "bothDirections"
 
+		if use_cache:
+			self._dump_cache = relationship_data
 		return relationship_data
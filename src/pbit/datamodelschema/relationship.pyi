@@ -1,4 +1,6 @@
-from typing import TypedDict
+from .tracking import Tracked as Tracked
+from .typeholder import intern_fields as intern_fields
+from typing import Any, TypedDict
 
 class RelationshipData(TypedDict):
     name: str
@@ -10,14 +12,32 @@ class RelationshipData(TypedDict):
     crossFilteringBehavior: str | None
     state: str
 
-class Relationship:
+NEW_RELATIONSHIP_DATA: RelationshipData
+INTERNED_RELATIONSHIP_FIELDS: tuple[str, ...]
+
+class Relationship(Tracked):
     name: str
-    from_table: str
-    from_column: str
-    to_table: str
-    to_column: str
     is_both_directions: bool
-    reference_data: RelationshipData
     def __init__(self, from_table: str, from_column: str, to_table: str, to_column: str, is_both_directions: bool = ...) -> None: ...
-    def load(self, data: RelationshipData): ...
-    def dump(self) -> RelationshipData: ...
+    @property
+    def reference_data(self) -> RelationshipData: ...
+    @reference_data.setter
+    def reference_data(self, reference_data: RelationshipData): ...
+    @property
+    def from_table(self) -> str: ...
+    @from_table.setter
+    def from_table(self, from_table: str): ...
+    @property
+    def from_column(self) -> str: ...
+    @from_column.setter
+    def from_column(self, from_column: str): ...
+    @property
+    def to_table(self) -> str: ...
+    @to_table.setter
+    def to_table(self, to_table: str): ...
+    @property
+    def to_column(self) -> str: ...
+    @to_column.setter
+    def to_column(self, to_column: str): ...
+    def load(self, data: RelationshipData, copy: bool = ...): ...
+    def dump(self, use_cache: bool = ...) -> RelationshipData: ...
@@ -0,0 +1,318 @@
+import os
+import json
+import codecs
+import threading
+import multiprocessing
+from abc import ABC, abstractmethod
+from multiprocessing.context import BaseContext
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, BinaryIO, Literal
+from json.encoder import encode_basestring_ascii
+from ..instrument import span
+from ..cancellation import check_cancelled
+
+STREAM_BUFFER_SIZE: int = 256 * 1024
+
+OutputProfile = Literal["indented", "compact"]
+
+INDENTED_INDENT: int = 4
+COMPACT_SEPARATORS: tuple[str, str] = (",", ":")
+
+# model.tables items sit under the root object, "model" and "tables"
+TABLE_FRAGMENT_LEVEL: int = 3
+
+# text that's already serialized at the level it's written at, it's written as is
+class RawJson(str):
+	pass
+
+def get_float_str(value: float) -> str:
+	if value != value:
+		return "NaN"
+	elif value == float("inf"):
+		return "Infinity"
+	elif value == -float("inf"):
+		return "-Infinity"
+	return float.__repr__(value)
+
+def get_key_str(key: Any) -> str:
+	if isinstance(key, str):
+		return key
+	elif key is True:
+		return "true"
+	elif key is False:
+		return "false"
+	elif key is None:
+		return "null"
+	elif isinstance(key, int):
+		return int.__repr__(key)
+	elif isinstance(key, float):
+		return get_float_str(key)
+	raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+# writes the same text as json.dumps(data, indent=indent), optionally leaving out None-valued keys as it goes
+def serialize(
+	data: Any,
+	write: Callable[[str], Any],
+	indent: int | None = 4,
+	skip_none: bool = True,
+	separators: tuple[str, str] | None = None,
+	level: int = 0
+):
+	if separators != None:
+		assert separators
+		item_separator, key_separator = separators
+	elif indent == None:
+		item_separator, key_separator = ", ", ": "
+	else:
+		item_separator, key_separator = ",", ": "
+	newlines: list[str] = []
+
+	def get_newline(level: int) -> str:
+		if indent == None:
+			return ""
+		while len(newlines) <= level:
+			newlines.append("\n" + " " * (indent * len(newlines)))
+		return newlines[level]
+
+	def encode(value: Any, level: int):
+		if isinstance(value, RawJson):
+			write(value)
+		elif isinstance(value, str):
+			write(encode_basestring_ascii(value))
+		elif value is None:
+			write("null")
+		elif value is True:
+			write("true")
+		elif value is False:
+			write("false")
+		elif isinstance(value, int):
+			write(int.__repr__(value))
+		elif isinstance(value, float):
+			write(get_float_str(value))
+		elif isinstance(value, dict):
+			newline = get_newline(level + 1)
+			is_empty = True
+			for key, item in value.items():
+				if item is None and skip_none:
+					continue
+				if is_empty:
+					write("{" + newline)
+					is_empty = False
+				else:
+					write(item_separator + newline)
+				write(encode_basestring_ascii(get_key_str(key)))
+				write(key_separator)
+				encode(item, level + 1)
+			if is_empty:
+				write("{}")
+			else:
+				write(get_newline(level) + "}")
+		elif isinstance(value, (list, tuple)):
+			if len(value) == 0:
+				write("[]")
+				return
+			newline = get_newline(level + 1)
+			write("[" + newline)
+			for i, item in enumerate(value):
+				if i > 0:
+					write(item_separator + newline)
+				encode(item, level + 1)
+			write(get_newline(level) + "]")
+		else:
+			raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+	encode(data, level)
+
+def dumps(
+	data: Any,
+	indent: int | None = 4,
+	skip_none: bool = True,
+	separators: tuple[str, str] | None = None,
+	level: int = 0
+) -> str:
+	parts: list[str] = []
+	serialize(data, parts.append, indent, skip_none, separators, level)
+	return "".join(parts)
+
+# the same text as dumps(data, None, skip_none, COMPACT_SEPARATORS) through the C encoder, RawJson is written as a string here
+def dumps_compact(data: Any, skip_none: bool = True) -> str:
+	if skip_none:
+		data = without_none_values(data)
+	return json.dumps(data, separators=COMPACT_SEPARATORS)
+
+def get_profile_format(profile: OutputProfile) -> tuple[int | None, tuple[str, str] | None]:
+	if profile == "compact":
+		return None, COMPACT_SEPARATORS
+	return INDENTED_INDENT, None
+
+# set in each worker by the pool initializer, with fork the items are inherited as is rather than pickled over
+FRAGMENT_ITEMS: list[Any] = []
+
+def set_fragment_items(items: list[Any]):
+	global FRAGMENT_ITEMS
+	FRAGMENT_ITEMS = items
+
+def dump_fragment(args: tuple[Any, OutputProfile, bool, int]) -> str:
+	data, profile, skip_none, level = args
+	if profile == "compact":
+		return dumps_compact(data, skip_none)
+	indent, separators = get_profile_format(profile)
+	return dumps(data, indent, skip_none, separators, level)
+
+def dump_inherited_fragment(args: tuple[int, OutputProfile, bool, int]) -> str:
+	index, profile, skip_none, level = args
+	return dump_fragment((FRAGMENT_ITEMS[index], profile, skip_none, level))
+
+# a child forked while other threads hold locks can deadlock, ex: when called from an aio worker thread
+def get_fragment_context() -> BaseContext:
+	mp_context = multiprocessing.get_context()
+	if mp_context.get_start_method() == "fork" and threading.active_count() > 1:
+		start_methods = multiprocessing.get_all_start_methods()
+		mp_context = multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
+	return mp_context
+
+def dump_fragments(
+	items: list[Any],
+	profile: OutputProfile = "indented",
+	skip_none: bool = True,
+	level: int = 0,
+	max_workers: int | None = None
+) -> list[RawJson]:
+	workers = max_workers or os.cpu_count() or 1
+	chunksize = max(1, len(items) // (workers * 4))
+	mp_context = get_fragment_context()
+	with span("dump_fragments", items=len(items), workers=workers):
+		if mp_context.get_start_method() == "fork":
+			executor = ProcessPoolExecutor(workers, mp_context, set_fragment_items, (items,))
+			func, jobs = dump_inherited_fragment, [(index, profile, skip_none, level) for index in range(len(items))]
+		else:
+			# other start methods would pickle all items into every worker, so each job carries its own
+			executor = ProcessPoolExecutor(workers, mp_context)
+			func, jobs = dump_fragment, [(item, profile, skip_none, level) for item in items]
+		with executor:
+			return [RawJson(text) for text in executor.map(func, jobs, chunksize=chunksize)]
+
+# a copy of data whose model.tables are serialized across worker processes, the rest is left to the encoder
+# compact data is returned as is, the C encoder writes it faster than the workers would and can't take RawJson
+def with_table_fragments(data: Any, profile: OutputProfile, skip_none: bool, max_workers: int | None = None) -> Any:
+	if profile == "compact":
+		return data
+	model = data.get("model")
+	if not isinstance(model, dict) or not isinstance(model.get("tables"), list) or len(model["tables"]) < 2:
+		return data
+	tables = dump_fragments(model["tables"], profile, skip_none, TABLE_FRAGMENT_LEVEL, max_workers)
+	return {**data, "model": {**model, "tables": tables}}
+
+# scalars are kept without a call per value, they make up most of a model
+def without_none_values(data: Any) -> Any:
+	if isinstance(data, dict):
+		return {
+			key: without_none_values(value) if isinstance(value, (dict, list, tuple)) else value
+			for key, value in data.items() if value is not None
+		}
+	elif isinstance(data, (list, tuple)):
+		return [without_none_values(value) if isinstance(value, (dict, list, tuple)) else value for value in data]
+	return data
+
+def serialize_to_stream(
+	data: Any,
+	fp: BinaryIO,
+	indent: int | None = 4,
+	skip_none: bool = True,
+	encoding: str = "utf-16-le",
+	buffer_size: int = STREAM_BUFFER_SIZE,
+	separators: tuple[str, str] | None = None
+):
+	encoder = codecs.getincrementalencoder(encoding)()
+	parts: list[str] = []
+	buffered = 0
+
+	def write(text: str):
+		nonlocal buffered
+		parts.append(text)
+		buffered += len(text)
+		if buffered >= buffer_size:
+			check_cancelled()
+			fp.write(encoder.encode("".join(parts)))
+			parts.clear()
+			buffered = 0
+
+	serialize(data, write, indent, skip_none, separators)
+	fp.write(encoder.encode("".join(parts), final=True))
+
+# subclasses that don't implement write can't be instantiated, so an incomplete encoder fails before it's registered
+class JsonEncoder(ABC):
+	name: str
+
+	def is_available(self) -> bool:
+		return True
+
+	@abstractmethod
+	def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str):
+		...
+
+class StdlibJsonEncoder(JsonEncoder):
+	name = "stdlib"
+
+	def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str):
+		# without newlines the output needs no level tracking, so compact text is left to the C encoder and held as one buffer
+		if profile == "compact":
+			with span("dumps_compact"):
+				text = dumps_compact(data, skip_none)
+			check_cancelled()
+			fp.write(text.encode(encoding))
+			return
+		indent, separators = get_profile_format(profile)
+		serialize_to_stream(data, fp, indent, skip_none, encoding, separators=separators)
+
+class OrjsonEncoder(JsonEncoder):
+	name = "orjson"
+
+	def is_available(self) -> bool:
+		try:
+			import orjson
+		except ImportError:
+			return False
+		return True
+
+	def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str):
+		# orjson only indents by 2 and can't skip keys, so the tree is stripped up front and held as one buffer
+		import orjson
+		if skip_none:
+			with span("strip_none"):
+				data = without_none_values(data)
+		option = orjson.OPT_NON_STR_KEYS
+		if profile == "indented":
+			option |= orjson.OPT_INDENT_2
+		fp.write(orjson.dumps(data, option=option).decode("utf-8").encode(encoding))
+
+JSON_ENCODERS: dict[str, JsonEncoder] = {
+	"stdlib": StdlibJsonEncoder(),
+	"orjson": OrjsonEncoder(),
+}
+
+# the first available entry is used when the encoder is "auto"
+AUTO_JSON_ENCODER_ORDER: list[str] = ["orjson", "stdlib"]
+
+def register_json_encoder(encoder: JsonEncoder, prefer: bool = False):
+	JSON_ENCODERS[encoder.name] = encoder
+	if encoder.name in AUTO_JSON_ENCODER_ORDER:
+		AUTO_JSON_ENCODER_ORDER.remove(encoder.name)
+	if prefer:
+		AUTO_JSON_ENCODER_ORDER.insert(0, encoder.name)
+	elif "stdlib" in AUTO_JSON_ENCODER_ORDER:
+		AUTO_JSON_ENCODER_ORDER.insert(AUTO_JSON_ENCODER_ORDER.index("stdlib"), encoder.name)
+	else:
+		AUTO_JSON_ENCODER_ORDER.append(encoder.name)
+
+def get_json_encoder(name: str = "stdlib") -> JsonEncoder:
+	if name == "auto":
+		for auto_name in AUTO_JSON_ENCODER_ORDER:
+			if auto_name in JSON_ENCODERS and JSON_ENCODERS[auto_name].is_available():
+				return JSON_ENCODERS[auto_name]
+		name = "stdlib"
+
+	assert name in JSON_ENCODERS, f"json encoder {name} is not registered"
+	encoder = JSON_ENCODERS[name]
+	assert encoder.is_available(), f"json encoder {name} is not installed"
+	return encoder
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from multiprocessing.context import BaseContext
+from typing import Any, BinaryIO, Callable, Literal
+
+STREAM_BUFFER_SIZE: int
+OutputProfile = Literal["indented", "compact"]
+INDENTED_INDENT: int
+COMPACT_SEPARATORS: tuple[str, str]
+TABLE_FRAGMENT_LEVEL: int
+
+class RawJson(str): ...
+
+def get_float_str(value: float) -> str: ...
+def get_key_str(key: Any) -> str: ...
+def serialize(data: Any, write: Callable[[str], Any], indent: int | None = ..., skip_none: bool = ..., separators: tuple[str, str] | None = ..., level: int = ...): ...
+def dumps(data: Any, indent: int | None = ..., skip_none: bool = ..., separators: tuple[str, str] | None = ..., level: int = ...) -> str: ...
+def dumps_compact(data: Any, skip_none: bool = ...) -> str: ...
+def get_profile_format(profile: OutputProfile) -> tuple[int | None, tuple[str, str] | None]: ...
+FRAGMENT_ITEMS: list[Any]
+
+def set_fragment_items(items: list[Any]): ...
+def dump_fragment(args: tuple[Any, OutputProfile, bool, int]) -> str: ...
+def dump_inherited_fragment(args: tuple[int, OutputProfile, bool, int]) -> str: ...
+def get_fragment_context() -> BaseContext: ...
+def dump_fragments(items: list[Any], profile: OutputProfile = ..., skip_none: bool = ..., level: int = ..., max_workers: int | None = ...) -> list[RawJson]: ...
+def with_table_fragments(data: Any, profile: OutputProfile, skip_none: bool, max_workers: int | None = ...) -> Any: ...
+def without_none_values(data: Any) -> Any: ...
+def serialize_to_stream(data: Any, fp: BinaryIO, indent: int | None = ..., skip_none: bool = ..., encoding: str = ..., buffer_size: int = ..., separators: tuple[str, str] | None = ...): ...
+
+class JsonEncoder(ABC):
+    name: str
+    def is_available(self) -> bool: ...
+    @abstractmethod
+    def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str): ...
+
+class StdlibJsonEncoder(JsonEncoder):
+    name: str
+    def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str): ...
+
+class OrjsonEncoder(JsonEncoder):
+    name: str
+    def is_available(self) -> bool: ...
+    def write(self, data: Any, fp: BinaryIO, profile: OutputProfile, skip_none: bool, encoding: str): ...
+
+JSON_ENCODERS: dict[str, JsonEncoder]
+AUTO_JSON_ENCODER_ORDER: list[str]
+
+def register_json_encoder(encoder: JsonEncoder, prefer: bool = ...): ...
+def get_json_encoder(name: str = ...) -> JsonEncoder: ...
@@ -8,6 +8,8 @@ from .partition import Partition, PartitionData
 from .measure import Measure, MeasureData
 from .typeholder import AnnotationData
 from .powerquery import MType
+from .tracking import Tracked
+from .inference import infer_dax_types
 
 class HierarchyLevelData(TypedDict):
 	name: str
@@ -21,6 +23,30 @@ class HierarchyData(TypedDict):
 	state: str
 	levels: list[HierarchyLevelData]
 
+# numpy dtype kinds, anything not listed is read in as a string, timedeltas are written out as whole milliseconds
+DTYPE_KIND_TO_DAX_TYPE: dict[str, DaxType] = {
+	"b": "boolean",
+	"i": "int64",
+	"u": "int64",
+	"f": "double",
+	"M": "dateTime",
+	"m": "int64",
+}
+
+def get_dax_types(df: pd.DataFrame) -> dict[str, DaxType]:
+	assert df.columns.is_unique, "dataframe column names must be unique"
+	return {str(name): DTYPE_KIND_TO_DAX_TYPE.get(dtype.kind, "string") for name, dtype in df.dtypes.items()}
+
+# to_json writes timedeltas as iso durations, which the int64 type transform can't read
+def get_json_ready_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+	timedelta_names = [name for name, dtype in df.dtypes.items() if dtype.kind == "m"]
+	if len(timedelta_names) == 0:
+		return df
+	df = df.copy()
+	for name in timedelta_names:
+		df[name] = (df[name] // pd.Timedelta(milliseconds=1)).astype("Int64")
+	return df
+
 class TableData(TypedDict):
 	name: str | None
 	isHidden: bool | None
@@ -33,23 +59,29 @@ class TableData(TypedDict):
 	annotations: list[AnnotationData]
 	measures: list[MeasureData] | None
 
-class Table():
-	name: str
+class Table(Tracked):
 	id: str
 	columns: list[Column]
 	partitions: list[Partition]
 	measures: list[Measure]
 	reference_data: TableData
+	_name: str
+	_owner: Any
+	_columns_by_name: dict[str, Column]
+	_measures_by_name: dict[str, Measure]
 
 	def __init__(
 		self,
 		name: str
 	):
-		self.name = name
+		self._owner = None
+		self._name = name
 		self.id = str(uuid4())
 		self.columns: list[Column] = []
 		self.partitions: list[Partition] = []
 		self.measures: list[Measure] = []
+		self._columns_by_name = {}
+		self._measures_by_name = {}
 		ref_data: Any = {
 			"name": self.name,
 			"lineageTag": self.id,
@@ -97,45 +129,122 @@ class Table():
 		}
 		self.reference_data: TableData = ref_data
 
+	@property
+	def name(self) -> str:
+		return self._name
+
+	@name.setter
+	def name(self, name: str):
+		old_name = self._name
+		self._name = name
+		if self._owner != None and old_name != name:
+			self._owner._rename_table(self, old_name, name)
+
+	def _rename_column(self, column: Column, old_name: str, new_name: str):
+		if self._columns_by_name.get(old_name) is column:
+			del self._columns_by_name[old_name]
+			# another column may still go by the old name, ex: one that was renamed onto it earlier
+			for other in self.columns:
+				if other.name == old_name:
+					self._columns_by_name[old_name] = other
+					break
+		self._columns_by_name.setdefault(new_name, column)
+
+	def _rename_measure(self, measure: Measure, old_name: str, new_name: str):
+		if self._measures_by_name.get(old_name) is measure:
+			del self._measures_by_name[old_name]
+			# another measure may still go by the old name, ex: one that was renamed onto it earlier
+			for other in self.measures:
+				if other.name == old_name:
+					self._measures_by_name[old_name] = other
+					break
+		self._measures_by_name.setdefault(new_name, measure)
+
+	def reindex(self):
+		self._columns_by_name = {}
+		for column in self.columns:
+			column._owner = self
+			self._columns_by_name.setdefault(column.name, column)
+
+		self._measures_by_name = {}
+		for measure in self.measures:
+			measure._owner = self
+			self._measures_by_name.setdefault(measure.name, measure)
+
+		for partition in self.partitions:
+			partition._owner = self
+		self.mark_dirty()
+
+	# without a type_dictionary the types are inferred from the file and always-null fields are left out
 	def bind_to_json(
 		self, 
 		relative_json_path: str, 
-		type_dictionary: dict[str, DaxType], 
-		group_name: str | None = None
+		type_dictionary: dict[str, DaxType] | None = None, 
+		group_name: str | None = None,
+		sample_size: int | None = None
 	):
+		if type_dictionary == None:
+			type_dictionary = infer_dax_types(relative_json_path, sample_size)["types"]
+		assert type_dictionary != None
 		self.new_partition(group_name).set_to_json_reader(relative_json_path, type_dictionary)
-		
-		# add columns
-		for name, col_type in type_dictionary.items():
-			self.new_column(name, col_type, name)
+		self.new_columns(type_dictionary)
+
+	# writes the frame out as json records when a path is given, otherwise only the columns are declared
+	def bind_to_dataframe(
+		self,
+		df: pd.DataFrame,
+		relative_json_path: str | None = None,
+		group_name: str | None = None
+	) -> dict[str, DaxType]:
+		type_dictionary = get_dax_types(df)
+		if relative_json_path == None:
+			self.new_columns(type_dictionary)
+		else:
+			assert relative_json_path
+			get_json_ready_dataframe(df).to_json(relative_json_path, orient="records", date_format="iso")
+			self.bind_to_json(relative_json_path, type_dictionary, group_name)
+		return type_dictionary
+
+	@classmethod
+	def from_dataframe(
+		cls,
+		name: str,
+		df: pd.DataFrame,
+		relative_json_path: str | None = None,
+		group_name: str | None = None
+	) -> "Table":
+		table = cls(name)
+		table.bind_to_dataframe(df, relative_json_path, group_name)
+		return table
 
 	def new_partition(self, name="", language="m", query_group: str | None = None) -> Partition:
 		if name == "":
 			name = self.name
 
 		partition = Partition(name, language, query_group)
+		partition._owner = self
 		self.partitions.append(partition)
+		self.mark_dirty()
 		return partition
 
 	def get_if_column_exists(self, name: str) -> bool:
-		for column in self.columns:
-			# print(name, " =? ", column.name)
-			if column.name == name:
-				return True
-		return False
+		column = self._columns_by_name.get(name)
+		return column != None and column.name == name
 
 	def get_column_by_name(self, name: str) -> Column:
-		final_column: Column | None = None
-		# print("column count: ", len(self.columns))
-		for column in self.columns:
-			# print(name, " =? ", column.name)
-			if column.name == name:
-				final_column = column
-				break
-
-		assert final_column, f"column {name} does not exist in table {self.name}"
+		final_column: Column | None = self._columns_by_name.get(name)
+		assert final_column and final_column.name == name, f"column {name} does not exist in table {self.name}"
 		return final_column
 
+	def get_if_measure_exists(self, name: str) -> bool:
+		measure = self._measures_by_name.get(name)
+		return measure != None and measure.name == name
+
+	def get_measure_by_name(self, name: str) -> Measure:
+		final_measure: Measure | None = self._measures_by_name.get(name)
+		assert final_measure and final_measure.name == name, f"measure {name} does not exist in table {self.name}"
+		return final_measure
+
 	def new_column(
 		self,
 		name: str,
@@ -148,9 +257,24 @@ class Table():
 		assert self.get_if_column_exists(name) == False, f"column with name {name} in table {self.name} already exists!"
 
 		column = Column(name, data_type, source_column)
+		column._owner = self
 		self.columns.append(column)
+		self._columns_by_name[name] = column
+		self.mark_dirty()
 		return column
 
+	def new_columns(self, type_dictionary: dict[str, DaxType]) -> list[Column]:
+		for name in type_dictionary:
+			assert self.get_if_column_exists(name) == False, f"column with name {name} in table {self.name} already exists!"
+
+		columns = [Column(name, data_type, name) for name, data_type in type_dictionary.items()]
+		for column in columns:
+			column._owner = self
+			self._columns_by_name[column.name] = column
+		self.columns.extend(columns)
+		self.mark_dirty()
+		return columns
+
 	def new_bin(self, target_column_name: str, increment: float, target_table_name: str | None = None,  bin_name: str | None = None, data_type: DaxType ="double") -> Column:
 		final_table_name = ""
 		if type(target_table_name) == str:
@@ -199,12 +323,19 @@ class Table():
 		return column
 
 	def new_measure(self, name: str) -> Measure:
+		assert self.get_if_measure_exists(name) == False, f"measure with name {name} in table {self.name} already exists!"
 		measure = Measure(name, "any")
+		measure._owner = self
 		self.measures.append(measure)
+		self._measures_by_name.setdefault(name, measure)
+		self.mark_dirty()
 		return measure
 
-	def load(self, data: TableData):
-		self.reference_data = deepcopy(data)
+	def load(self, data: TableData, copy: bool = True):
+		if copy:
+			self.reference_data = deepcopy(data)
+		else:
+			self.reference_data = data
 		if "name" in self.reference_data:
 			name = self.reference_data["name"]
 			assert name
@@ -214,28 +345,108 @@ class Table():
 
 		for column_data in self.reference_data["columns"]:
 			column = self.new_column(str(uuid4()), "any")
-			column.load(column_data)
+			column.load(column_data, copy=False)
 		self.reference_data["columns"] = []
 
 		for partition_data in self.reference_data["partitions"]:
 			partition = self.new_partition("")
-			partition.load(partition_data)
+			partition.load(partition_data, copy=False)
 
 		self.reference_data["partitions"] = []
 
-	def dump(self) -> TableData:
-		table_data: TableData = deepcopy(self.reference_data)
+		# loaded one by one rather than through new_measure, so duplicates are left for validation to report
+		measures_data = self.reference_data.get("measures")
+		if measures_data:
+			for measure_data in measures_data:
+				measure = Measure("", "any")
+				measure._owner = self
+				measure.load(measure_data, copy=False)
+				self.measures.append(measure)
+				self._measures_by_name.setdefault(measure.name, measure)
+			self.reference_data["measures"] = None
+
+	def dump(self, use_cache: bool = False) -> TableData:
+		if use_cache and self._dump_cache != None:
+			return self._dump_cache
+		table_data: TableData = self.reference_data.copy()
+		table_data["name"] = self.name
+		table_data["lineageTag"] = self.id
+		table_data["columns"] = self.reference_data["columns"].copy()
+		table_data["partitions"] = self.reference_data["partitions"].copy()
 
 		for column in self.columns:
-			table_data["columns"].append(column.dump())
+			table_data["columns"].append(column.dump(use_cache))
 
 		for partition in self.partitions:
-			table_data["partitions"].append(partition.dump())
+			table_data["partitions"].append(partition.dump(use_cache))
 
 		if len(self.measures) > 0:
 			measure_list = []
 			for measure in self.measures:
-				measure_list.append(measure.dump())
+				measure_list.append(measure.dump(use_cache))
 			table_data["measures"] = measure_list
 
+		if use_cache:
+			self._dump_cache = table_data
 		return table_data
+
+
+class TableProxy():
+	_data: TableData
+	_table: Table | None
+	_owner: Any
+
+	def __init__(self, data: TableData, owner: Any = None):
+		object.__setattr__(self, "_data", data)
+		object.__setattr__(self, "_table", None)
+		object.__setattr__(self, "_owner", owner)
+
+	@property
+	def name(self) -> str:
+		if self._table != None:
+			assert self._table
+			return self._table.name
+		name = self._data["name"] if "name" in self._data else None
+		assert name, "table data has no name"
+		return name
+
+	def is_loaded(self) -> bool:
+		return self._table != None
+
+	def materialize(self) -> Table:
+		if self._table == None:
+			table = Table("")
+			table.load(self._data, copy=False)
+			table._owner = self
+			object.__setattr__(self, "_table", table)
+		assert self._table
+		return self._table
+
+	def _rename_table(self, table: Table, old_name: str, new_name: str):
+		if self._owner != None:
+			self._owner._rename_table(self, old_name, new_name)
+
+	def mark_dirty(self):
+		if self._owner != None:
+			self._owner.mark_dirty()
+
+	# private and special names aren't forwarded, copy and pickle look them up before the proxy is set up
+	def __getattr__(self, key: str) -> Any:
+		if key.startswith("_"):
+			raise AttributeError(key)
+		return getattr(self.materialize(), key)
+
+	def __reduce__(self) -> Any:
+		return (TableProxy, (self._data, self._owner), {"_table": self._table})
+
+	def __setstate__(self, state: dict[str, Any]):
+		object.__setattr__(self, "_table", state["_table"])
+
+	def __setattr__(self, key: str, value: Any):
+		setattr(self.materialize(), key, value)
+
+	def dump(self, use_cache: bool = False) -> TableData:
+		if self._table == None:
+			return self._data
+		assert self._table
+		return self._table.dump(use_cache)
@@ -4,7 +4,10 @@ from .measure import Measure as Measure, MeasureData as MeasureData
 from .partition import Partition as Partition, PartitionData as PartitionData
 from .powerquery import MType as MType
 from .typeholder import AnnotationData as AnnotationData
-from typing import TypedDict
+from .tracking import Tracked as Tracked
+from .inference import infer_dax_types as infer_dax_types
+from pandas import DataFrame
+from typing import Any, TypedDict
 
 class HierarchyLevelData(TypedDict):
     name: str
@@ -18,6 +21,11 @@ class HierarchyData(TypedDict):
     state: str
     levels: list[HierarchyLevelData]
 
+DTYPE_KIND_TO_DAX_TYPE: dict[str, DaxType]
+
+def get_dax_types(df: DataFrame) -> dict[str, DaxType]: ...
+def get_json_ready_dataframe(df: DataFrame) -> DataFrame: ...
+
 class TableData(TypedDict):
     name: str | None
     isHidden: bool | None
@@ -30,22 +38,45 @@ class TableData(TypedDict):
     annotations: list[AnnotationData]
     measures: list[MeasureData] | None
 
-class Table:
-    name: str
+class Table(Tracked):
     id: str
     columns: list[Column]
     partitions: list[Partition]
     measures: list[Measure]
     reference_data: TableData
     def __init__(self, name: str) -> None: ...
-    def bind_to_json(self, relative_json_path: str, type_dictionary: dict[str, DaxType], group_name: str | None = ...): ...
+    @property
+    def name(self) -> str: ...
+    @name.setter
+    def name(self, name: str): ...
+    def reindex(self) -> None: ...
+    def bind_to_json(self, relative_json_path: str, type_dictionary: dict[str, DaxType] | None = ..., group_name: str | None = ..., sample_size: int | None = ...): ...
+    def bind_to_dataframe(self, df: DataFrame, relative_json_path: str | None = ..., group_name: str | None = ...) -> dict[str, DaxType]: ...
+    @classmethod
+    def from_dataframe(cls, name: str, df: DataFrame, relative_json_path: str | None = ..., group_name: str | None = ...) -> Table: ...
     def new_partition(self, name: str = ..., language: str = ..., query_group: str | None = ...) -> Partition: ...
     def get_if_column_exists(self, name: str) -> bool: ...
     def get_column_by_name(self, name: str) -> Column: ...
+    def get_if_measure_exists(self, name: str) -> bool: ...
+    def get_measure_by_name(self, name: str) -> Measure: ...
     def new_column(self, name: str, data_type: DaxType, source_column: None | str = ...) -> Column: ...
+    def new_columns(self, type_dictionary: dict[str, DaxType]) -> list[Column]: ...
     def new_bin(self, target_column_name: str, increment: float, target_table_name: str | None = ..., bin_name: str | None = ..., data_type: DaxType = ...) -> Column: ...
     def new_dax_column(self, dax: str, name: str, data_type: DaxType = ..., summarize_by: SummaryType = ...) -> Column: ...
     def new_normalized_column(self, numerator_column_name: str, denominator_column_name: str, denominator_table_name: None | str = ..., name: None | str = ..., data_type: DaxType = ..., summarize_by: SummaryType = ...): ...
     def new_measure(self, name: str) -> Measure: ...
-    def load(self, data: TableData): ...
-    def dump(self) -> TableData: ...
+    def load(self, data: TableData, copy: bool = ...): ...
+    def dump(self, use_cache: bool = ...) -> TableData: ...
+
+class TableProxy:
+    def __init__(self, data: TableData, owner: Any = ...) -> None: ...
+    @property
+    def name(self) -> str: ...
+    def is_loaded(self) -> bool: ...
+    def materialize(self) -> Table: ...
+    def mark_dirty(self) -> None: ...
+    def __getattr__(self, key: str) -> Any: ...
+    def __reduce__(self) -> Any: ...
+    def __setstate__(self, state: dict[str, Any]): ...
+    def __setattr__(self, key: str, value: Any): ...
+    def dump(self, use_cache: bool = ...) -> TableData: ...
@@ -0,0 +1,20 @@
+from typing import Any
+
+class Tracked():
+	__slots__ = ("_dump_cache", "_owner")
+
+	def __setattr__(self, key: str, value: Any):
+		object.__setattr__(self, key, value)
+		if key != "_dump_cache" and key != "_owner":
+			self.mark_dirty()
+
+	# changes made in place to reference_data or other containers aren't seen, call this after making them
+	def mark_dirty(self):
+		object.__setattr__(self, "_dump_cache", None)
+		# owners are other tracked objects, a TableProxy or the DataModelSchema, which all take mark_dirty
+		owner = getattr(self, "_owner", None)
+		if owner != None:
+			owner.mark_dirty()
+
+	def is_dirty(self) -> bool:
+		return getattr(self, "_dump_cache", None) is None
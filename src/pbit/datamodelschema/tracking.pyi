@@ -0,0 +1,6 @@
+from typing import Any
+
+class Tracked:
+    def __setattr__(self, key: str, value: Any): ...
+    def mark_dirty(self) -> None: ...
+    def is_dirty(self) -> bool: ...
@@ -1,3 +1,4 @@
+import sys
 from typing import TypedDict, Literal, Any
 from uuid import uuid4
 from copy import deepcopy
@@ -5,3 +6,40 @@ from copy import deepcopy
 class AnnotationData(TypedDict):
 	name: str
 	value: str
+
+# a dict that can't be changed in place, so one instance can be shared by many objects
+class ReadOnlyDict(dict):
+	def _read_only(self, *args: Any, **kwargs: Any):
+		raise TypeError("this dict is shared and read only, copy it before editing")
+
+	__setitem__ = _read_only
+	__delitem__ = _read_only
+	__ior__ = _read_only
+	clear = _read_only
+	pop = _read_only
+	popitem = _read_only
+	setdefault = _read_only
+	update = _read_only
+
+	def __copy__(self) -> "ReadOnlyDict":
+		return self
+
+	def __deepcopy__(self, memo: Any) -> "ReadOnlyDict":
+		return self
+
+	def __reduce__(self) -> Any:
+		return (ReadOnlyDict, (dict(self),))
+
+def intern_fields(data: Any, keys: tuple[str, ...]):
+	for key in keys:
+		value = data.get(key)
+		if isinstance(value, str):
+			data[key] = sys.intern(value)
+
+def intern_annotations(annotations: list[AnnotationData] | None):
+	if annotations == None:
+		return
+	assert annotations != None
+	for annotation in annotations:
+		if isinstance(annotation, dict):
+			intern_fields(annotation, ("name",))
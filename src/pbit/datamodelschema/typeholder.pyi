@@ -1,7 +1,15 @@
 from copy import deepcopy as deepcopy
-from typing import TypedDict
+from typing import Any, TypedDict
 from uuid import uuid4 as uuid4
 
 class AnnotationData(TypedDict):
     name: str
     value: str
+
+class ReadOnlyDict(dict):
+    def __copy__(self) -> ReadOnlyDict: ...
+    def __deepcopy__(self, memo: Any) -> ReadOnlyDict: ...
+    def __reduce__(self) -> Any: ...
+
+def intern_fields(data: Any, keys: tuple[str, ...]): ...
+def intern_annotations(annotations: list[AnnotationData] | None): ...
@@ -0,0 +1,136 @@
+from typing import TypedDict, Literal, Any
+
+ValidationIssueKind = Literal[
+	"duplicate_table",
+	"duplicate_column",
+	"duplicate_measure",
+	"duplicate_lineage_tag",
+	"missing_table",
+	"missing_column",
+	"missing_query_group",
+]
+
+class ValidationIssueData(TypedDict):
+	kind: ValidationIssueKind
+	path: str
+	message: str
+
+def get_issue(kind: ValidationIssueKind, path: str, message: str) -> ValidationIssueData:
+	return {
+		"kind": kind,
+		"path": path,
+		"message": message,
+	}
+
+# every name is indexed in one pass over the schema and each reference is then checked against those indexes
+def validate_schema(schema_data: Any) -> list[ValidationIssueData]:
+	issues: list[ValidationIssueData] = []
+	model_data = schema_data.get("model") or {}
+	tables = model_data.get("tables") or []
+	query_groups = set(group.get("folder") for group in model_data.get("queryGroups") or [])
+
+	columns_by_table: dict[str, set[str]] = {}
+	# each table's own column names, a duplicate table's references are checked against its own columns
+	table_column_names: list[set[str]] = []
+	lineage_tag_paths: dict[str, str] = {}
+
+	def add_lineage_tag(item: Any, path: str):
+		lineage_tag = item.get("lineageTag")
+		if lineage_tag == None:
+			return
+		if lineage_tag in lineage_tag_paths:
+			issues.append(get_issue(
+				"duplicate_lineage_tag",
+				path,
+				f"lineageTag {lineage_tag} is already used by {lineage_tag_paths[lineage_tag]}"
+			))
+		else:
+			lineage_tag_paths[lineage_tag] = path
+
+	for table in tables:
+		table_name = table.get("name")
+		table_path = f"tables[{table_name}]"
+		if table_name in columns_by_table:
+			issues.append(get_issue("duplicate_table", table_path, f"table {table_name} is defined more than once"))
+			table_column_names.append(set(column.get("name") for column in table.get("columns") or []))
+			continue
+		add_lineage_tag(table, table_path)
+
+		column_names: set[str] = set()
+		for column in table.get("columns") or []:
+			column_name = column.get("name")
+			column_path = f"{table_path}.columns[{column_name}]"
+			if column_name in column_names:
+				issues.append(get_issue("duplicate_column", column_path, f"column {column_name} is defined more than once in table {table_name}"))
+			column_names.add(column_name)
+			add_lineage_tag(column, column_path)
+		columns_by_table[table_name] = column_names
+		table_column_names.append(column_names)
+
+		measure_names: set[str] = set()
+		for measure in table.get("measures") or []:
+			measure_name = measure.get("name")
+			measure_path = f"{table_path}.measures[{measure_name}]"
+			if measure_name in measure_names:
+				issues.append(get_issue("duplicate_measure", measure_path, f"measure {measure_name} is defined more than once in table {table_name}"))
+			measure_names.add(measure_name)
+			add_lineage_tag(measure, measure_path)
+
+		for hierarchy in table.get("hierarchies") or []:
+			add_lineage_tag(hierarchy, f"{table_path}.hierarchies[{hierarchy.get('name')}]")
+
+	for table, column_names in zip(tables, table_column_names):
+		table_name = table.get("name")
+		table_path = f"tables[{table_name}]"
+
+		for column in table.get("columns") or []:
+			sort_by_column = column.get("sortByColumn")
+			if sort_by_column != None and not sort_by_column in column_names:
+				issues.append(get_issue(
+					"missing_column",
+					f"{table_path}.columns[{column.get('name')}].sortByColumn",
+					f"sortByColumn {sort_by_column} does not exist in table {table_name}"
+				))
+
+		for hierarchy in table.get("hierarchies") or []:
+			hierarchy_path = f"{table_path}.hierarchies[{hierarchy.get('name')}]"
+			for level in hierarchy.get("levels") or []:
+				level_column = level.get("column")
+				if not level_column in column_names:
+					issues.append(get_issue(
+						"missing_column",
+						f"{hierarchy_path}.levels[{level.get('name')}].column",
+						f"hierarchy level column {level_column} does not exist in table {table_name}"
+					))
+
+		for partition in table.get("partitions") or []:
+			query_group = partition.get("queryGroup")
+			if query_group != None and not query_group in query_groups:
+				issues.append(get_issue(
+					"missing_query_group",
+					f"{table_path}.partitions[{partition.get('name')}].queryGroup",
+					f"query group {query_group} is not one of the model's queryGroups"
+				))
+
+	for relationship in model_data.get("relationships") or []:
+		relationship_path = f"relationships[{relationship.get('name')}]"
+		for table_key, column_key in [("fromTable", "fromColumn"), ("toTable", "toColumn")]:
+			table_name = relationship.get(table_key)
+			column_name = relationship.get(column_key)
+			if not table_name in columns_by_table:
+				issues.append(get_issue(
+					"missing_table",
+					f"{relationship_path}.{table_key}",
+					f"{table_key} {table_name} does not exist"
+				))
+			elif not column_name in columns_by_table[table_name]:
+				issues.append(get_issue(
+					"missing_column",
+					f"{relationship_path}.{column_key}",
+					f"{column_key} {column_name} does not exist in table {table_name}"
+				))
+
+	return issues
+
+def get_validation_message(issues: list[ValidationIssueData]) -> str:
+	return "model has broken references:\n" + "\n".join(f"\t{issue['path']}: {issue['message']}" for issue in issues)
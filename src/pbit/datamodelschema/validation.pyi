@@ -0,0 +1,12 @@
+from typing import Any, Literal, TypedDict
+
+ValidationIssueKind = Literal["duplicate_table", "duplicate_column", "duplicate_measure", "duplicate_lineage_tag", "missing_table", "missing_column", "missing_query_group"]
+
+class ValidationIssueData(TypedDict):
+    kind: ValidationIssueKind
+    path: str
+    message: str
+
+def get_issue(kind: ValidationIssueKind, path: str, message: str) -> ValidationIssueData: ...
+def validate_schema(schema_data: Any) -> list[ValidationIssueData]: ...
+def get_validation_message(issues: list[ValidationIssueData]) -> str: ...
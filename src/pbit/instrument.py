@@ -0,0 +1,164 @@
+import time
+import threading
+import tracemalloc
+from contextvars import ContextVar, Token
+from typing import TypedDict, Callable, Any
+
+class SpanData(TypedDict):
+	name: str
+	parent: str | None
+	start: float
+	duration: float
+	counters: dict[str, int]
+
+SpanCallback = Callable[[SpanData], Any]
+
+class Instrumentation():
+	spans: list[SpanData]
+	counters: dict[str, int]
+	callback: SpanCallback | None
+	trace_memory: bool
+	_lock: threading.Lock
+	_token: Token | None
+	_started_tracemalloc: bool
+
+	def __init__(self, callback: SpanCallback | None = None, trace_memory: bool = False):
+		self.spans = []
+		self.counters = {}
+		self.callback = callback
+		self.trace_memory = trace_memory
+		self._lock = threading.Lock()
+		self._token = None
+		self._started_tracemalloc = False
+
+	def __enter__(self) -> "Instrumentation":
+		assert self._token == None, "instrumentation is already active"
+		if self.trace_memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			self._started_tracemalloc = True
+		self._token = ACTIVE_INSTRUMENTATION.set(self)
+		return self
+
+	def __exit__(self, *args):
+		assert self._token
+		ACTIVE_INSTRUMENTATION.reset(self._token)
+		self._token = None
+		if self._started_tracemalloc:
+			tracemalloc.stop()
+			self._started_tracemalloc = False
+
+	# spans can end on several threads at once when the instrumentation is shared by copied contexts
+	def _add_span(self, span_data: SpanData):
+		with self._lock:
+			self.spans.append(span_data)
+
+	def _add_count(self, name: str, value: int):
+		with self._lock:
+			self.counters[name] = self.counters.get(name, 0) + value
+
+	def get_totals(self) -> dict[str, float]:
+		totals: dict[str, float] = {}
+		for span_data in self.spans:
+			totals[span_data["name"]] = totals.get(span_data["name"], 0.0) + span_data["duration"]
+		return totals
+
+# the span stack is kept per context, so calls run in copies of the context nest their spans separately
+class Span():
+	instrumentation: Instrumentation
+	data: SpanData
+	parent_span: "Span | None"
+	_token: Token | None
+	_start_memory: int
+	_peak_memory: int
+
+	def __init__(self, instrumentation: Instrumentation, name: str, counters: dict[str, int]):
+		self.instrumentation = instrumentation
+		self.data = {
+			"name": name,
+			"parent": None,
+			"start": 0.0,
+			"duration": 0.0,
+			"counters": counters,
+		}
+		self.parent_span = None
+		self._token = None
+		self._start_memory = 0
+		self._peak_memory = 0
+
+	def __enter__(self) -> SpanData:
+		parent_span = ACTIVE_SPAN.get()
+		if parent_span != None and parent_span.instrumentation is self.instrumentation:
+			assert parent_span
+			self.parent_span = parent_span
+			self.data["parent"] = parent_span.data["name"]
+		if self.instrumentation.trace_memory and tracemalloc.is_tracing():
+			# resetting the peak would hide it from the enclosing span, so it's folded in first
+			current, peak = tracemalloc.get_traced_memory()
+			if self.parent_span != None:
+				assert self.parent_span
+				self.parent_span._peak_memory = max(self.parent_span._peak_memory, peak)
+			tracemalloc.reset_peak()
+			self._start_memory = current
+			self._peak_memory = current
+		self._token = ACTIVE_SPAN.set(self)
+		self.data["start"] = time.perf_counter()
+		return self.data
+
+	def __exit__(self, *args):
+		self.data["duration"] = time.perf_counter() - self.data["start"]
+		assert self._token
+		ACTIVE_SPAN.reset(self._token)
+		self._token = None
+		if self.instrumentation.trace_memory and tracemalloc.is_tracing():
+			self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+			self.data["counters"]["peak_memory"] = self._peak_memory - self._start_memory
+			if self.parent_span != None:
+				assert self.parent_span
+				self.parent_span._peak_memory = max(self.parent_span._peak_memory, self._peak_memory)
+
+		self.instrumentation._add_span(self.data)
+		if self.instrumentation.callback != None:
+			assert self.instrumentation.callback
+			self.instrumentation.callback(self.data)
+
+class NullSpan():
+	def __enter__(self) -> SpanData | None:
+		return None
+
+	def __exit__(self, *args):
+		pass
+
+NULL_SPAN = NullSpan()
+
+ACTIVE_INSTRUMENTATION: ContextVar[Instrumentation | None] = ContextVar("pbit_instrumentation", default=None)
+ACTIVE_SPAN: ContextVar[Span | None] = ContextVar("pbit_span", default=None)
+
+def get_active_instrumentation() -> Instrumentation | None:
+	return ACTIVE_INSTRUMENTATION.get()
+
+# a no-op unless an Instrumentation is active in the current context
+def span(name: str, **counters: int) -> Span | NullSpan:
+	instrumentation = ACTIVE_INSTRUMENTATION.get()
+	if instrumentation == None:
+		return NULL_SPAN
+	assert instrumentation
+	return Span(instrumentation, name, counters)
+
+def count(name: str, value: int):
+	instrumentation = ACTIVE_INSTRUMENTATION.get()
+	if instrumentation == None:
+		return
+	assert instrumentation
+	instrumentation._add_count(name, value)
+	active_span = ACTIVE_SPAN.get()
+	if active_span != None and active_span.instrumentation is instrumentation:
+		assert active_span
+		counters = active_span.data["counters"]
+		counters[name] = counters.get(name, 0) + value
+
+def count_model(data: Any):
+	if ACTIVE_INSTRUMENTATION.get() == None:
+		return
+	tables = data.get("model", {}).get("tables") or []
+	count("tables", len(tables))
+	count("columns", sum(len(table.get("columns") or []) for table in tables))
@@ -0,0 +1,42 @@
+from contextvars import ContextVar
+from typing import Any, Callable, TypedDict
+
+class SpanData(TypedDict):
+    name: str
+    parent: str | None
+    start: float
+    duration: float
+    counters: dict[str, int]
+
+SpanCallback = Callable[[SpanData], Any]
+
+class Instrumentation:
+    spans: list[SpanData]
+    counters: dict[str, int]
+    callback: SpanCallback | None
+    trace_memory: bool
+    def __init__(self, callback: SpanCallback | None = ..., trace_memory: bool = ...) -> None: ...
+    def __enter__(self) -> Instrumentation: ...
+    def __exit__(self, *args) -> None: ...
+    def get_totals(self) -> dict[str, float]: ...
+
+class Span:
+    instrumentation: Instrumentation
+    data: SpanData
+    parent_span: Span | None
+    def __init__(self, instrumentation: Instrumentation, name: str, counters: dict[str, int]) -> None: ...
+    def __enter__(self) -> SpanData: ...
+    def __exit__(self, *args) -> None: ...
+
+class NullSpan:
+    def __enter__(self) -> SpanData | None: ...
+    def __exit__(self, *args) -> None: ...
+
+NULL_SPAN: NullSpan
+ACTIVE_INSTRUMENTATION: ContextVar[Instrumentation | None]
+ACTIVE_SPAN: ContextVar[Span | None]
+
+def get_active_instrumentation() -> Instrumentation | None: ...
+def span(name: str, **counters: int) -> Span | NullSpan: ...
+def count(name: str, value: int): ...
+def count_model(data: Any): ...
@@ -0,0 +1,57 @@
+from .datamodelschema import DataModelSchema, DataModelSchemaData, OutputProfile, decode
+from .archive import rewrite, read_member, map_member, get_schema_writer, SCHEMA_MEMBER_NAME
+from .cache import ModelCache
+from .instrument import span, count, count_model
+from .cancellation import check_cancelled
+
+def write_model(
+	pbit_file_path: str,
+	source: DataModelSchemaData | DataModelSchema,
+	profile: OutputProfile = "indented",
+	encoder: str = "stdlib",
+	use_cache: bool = False,
+	validate: bool = False,
+	max_workers: int | None = 1
+):
+	with span("write_model"):
+		rewrite(pbit_file_path, pbit_file_path, {
+			SCHEMA_MEMBER_NAME: get_schema_writer(source, profile, encoder, use_cache, validate, max_workers)
+		})
+
+def decode_model(pbit_file_path: str, use_mmap: bool = False) -> DataModelSchemaData:
+	if not use_mmap:
+		return decode(read_member(pbit_file_path, SCHEMA_MEMBER_NAME))
+	with map_member(pbit_file_path, SCHEMA_MEMBER_NAME) as member_data:
+		return decode(member_data)
+
+def read_model(pbit_file_path: str, cache: ModelCache | None = None, use_mmap: bool = False) -> DataModelSchemaData:
+	with span("read_model"):
+		if cache == None:
+			return decode_model(pbit_file_path, use_mmap)
+
+		assert cache
+		key = cache.get_key(pbit_file_path)
+		cached_data = cache.get(key)
+		if cached_data != None:
+			assert cached_data
+			count("cache_hits", 1)
+			return cached_data
+
+		data = decode_model(pbit_file_path, use_mmap)
+		cache.put(key, data)
+		return data
+
+def load_model(
+	pbit_file_path: str,
+	lazy: bool = False,
+	cache: ModelCache | None = None,
+	use_mmap: bool = False
+) -> DataModelSchema:
+	with span("load_model"):
+		data = read_model(pbit_file_path, cache, use_mmap)
+		model = DataModelSchema()
+		check_cancelled()
+		with span("load"):
+			count_model(data)
+			model.load(data, lazy, copy=False)
+		return model
@@ -0,0 +1,8 @@
+from .archive import SCHEMA_MEMBER_NAME as SCHEMA_MEMBER_NAME, get_schema_writer as get_schema_writer, map_member as map_member, read_member as read_member, rewrite as rewrite
+from .cache import ModelCache as ModelCache
+from .datamodelschema import DataModelSchema as DataModelSchema, DataModelSchemaData as DataModelSchemaData, OutputProfile as OutputProfile
+
+def write_model(pbit_file_path: str, source: DataModelSchemaData | DataModelSchema, profile: OutputProfile = ..., encoder: str = ..., use_cache: bool = ..., validate: bool = ..., max_workers: int | None = ...): ...
+def decode_model(pbit_file_path: str, use_mmap: bool = ...) -> DataModelSchemaData: ...
+def read_model(pbit_file_path: str, cache: ModelCache | None = ..., use_mmap: bool = ...) -> DataModelSchemaData: ...
+def load_model(pbit_file_path: str, lazy: bool = ..., cache: ModelCache | None = ..., use_mmap: bool = ...) -> DataModelSchema: ...